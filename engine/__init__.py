@@ -0,0 +1,52 @@
+"""예비 신혼부부 재정 시뮬레이션 계산 엔진 (Streamlit 비의존)
+
+pandas를 쓰는 묶음 계산 모듈(batch, compare, bench)은 패키지 import 시간을 늘리지 않도록 여기서
+다시 내보내지 않는다. 필요한 곳에서 engine.compare 등 모듈을 직접 import한다.
+"""
+from .income import (
+    calc_net_salary_from_gross,
+    gross_to_net_list,
+    monthly_net_from_annual,
+    raise_factors,
+    project_gross,
+    gross_to_net,
+    net_to_gross_list,
+)
+from .payroll import PayrollRules, RULES_2024, deductions, net_pay, net_to_gross
+from .leave import (
+    LeaveRule,
+    LEAVE_RULES,
+    rule_index,
+    leave_pay,
+    apply_leaves,
+    get_parental_leave_pay,
+    parental_leave_pay,
+    insert_parental_leave,
+)
+from .childcare import CHILDCARE_BANDS, childcare_costs, get_childcare_cost
+from .budget import EXPENSE_GROUPS, inflation_factors, expense_matrix, group_totals, build_expenses
+from .loan import (
+    ANNUITY,
+    EQUAL_PRINCIPAL,
+    BULLET,
+    REPAYMENT_TYPES,
+    Schedule,
+    monthly_payment,
+    amortization_schedule,
+    rate_path,
+    loan_schedule,
+    house_value_path,
+)
+from .sweep import LoanGrid, loan_grid
+from .solver import Household, evaluate, max_house_price, min_cash, purchase_year_feasibility, latest_purchase_year
+from .montecarlo import MarketModel, ProjectionInputs, run_monte_carlo, fan
+from .parallel import run_monte_carlo_parallel
+from .networth import Account, DEFAULT_ACCOUNTS, NetWorth, accumulate, net_worth
+from .cache import LRUCache, fingerprint, memoize
+from .graph import Graph
+from .compact import compact, nbytes, shared_years
+from .timeline import Timeline, timeline
+from .timing import SpanRecorder
+from .store import ScenarioStore
+from .pipeline import build_household_graph
+from .stages import expense_stage, loan_product_stage, sweep_stage, monte_carlo_stage
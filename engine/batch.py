@@ -0,0 +1,336 @@
+# 여러 가구 프로필(CSV/Parquet)을 묶음 단위로 한 번에 예측하는 배치 CLI
+#
+#   python -m engine.batch profiles.csv --out-dir out/ [--chunk-size 1000] [--format csv|parquet]
+#
+# 가구별 월별 장부(ledger)와 연도별 요약(summary)을 묶음마다 파일에 이어 쓰므로
+# 입력 크기와 무관하게 메모리 사용량은 묶음 크기에만 비례한다.
+import argparse
+import os
+import sys
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .budget import inflation_factors
+from .childcare import childcare_costs
+from .income import gross_to_net
+from .leave import apply_leaves
+from .loan import ANNUITY, REPAYMENT_TYPES, loan_schedule, rate_path
+
+BASE_YEAR = 2024
+
+# 프로필 컬럼 기본값 (앱 화면 기본값과 동일, 금액 단위 만원)
+DEFAULT_PROFILE = {
+    "husband_birth": 1990, "husband_retire_age": 60, "husband_annual": 4800, "husband_rate": 3.5,
+    "wife_birth": 1992, "wife_retire_age": 60, "wife_annual": 3600, "wife_rate": 3.5,
+    "husband_gross": "", "wife_gross": "",  # 1~12월 세전 월급 "400;400;...;300" (있으면 {e}_annual 대신 사용)
+    "hy_start_year": BASE_YEAR, "hy_start_month": 1, "hy_months": 0,
+    "wy_start_year": BASE_YEAR, "wy_start_month": 1, "wy_months": 0,
+    "leaves": "",               # 추가 휴직 "wife:2025-03:12;husband:2026-01:6" 형식 (소득자:시작 연도-월:개월 수)
+    "parents_bonus": True,      # 부부가 가까이 휴직하면 부모 동반 휴직 특례 적용
+    "custom_leave_pay": "",     # 휴직 1~N개월 수동 급여 "150;150;120" (모든 휴직에 적용, 이후 달은 자동 계산)
+    "children": "",             # "2025-03;2027-06" 형식 (출생연도-월)
+    "fixed_expense": 125,       # 월 고정비 합계
+    "var_expense": 33,          # 월 변동비 합계
+    "inflation": 2.2,
+    "house_price": 0,           # 0이면 housing_payment를 물가 반영 월 주거비로 사용
+    "cash": 0,
+    "loan_rate": 3.8,
+    "loan_year": 30,
+    "repayment": ANNUITY,       # 상환 방식: annuity(원리금균등) / equal_principal(원금균등) / bullet(만기일시)
+    "grace_months": 0,          # 거치 기간 (이자만 내는 개월 수, 만기에 포함)
+    "rate_changes": "",         # 금리 변경 "60:4.5;120:5.0" 형식 (적용 시작 월 인덱스:연 금리 %)
+    "housing_payment": 0,
+}
+EARNERS = ("husband", "wife")
+LEAVE_PREFIX = ("hy", "wy")
+NO_CHILD_YEAR = 9999  # 자녀 없음 자리표시 (나이가 항상 음수 → 육아비 0)
+
+
+class HouseholdProjection(NamedTuple):
+    """가구 × 월 배열 모음. months는 가구별 유효 개월 수(은퇴 시점까지)"""
+    months: np.ndarray
+    earner_net: np.ndarray      # 가구 × 소득자 × 월
+    fixed: np.ndarray
+    var: np.ndarray
+    childcare: np.ndarray
+    housing: np.ndarray
+    loan_balance: np.ndarray    # 가구 × 월 대출 잔액 (집을 사지 않으면 0)
+
+    @property
+    def income(self):
+        return self.earner_net.sum(axis=1)
+
+    @property
+    def expense(self):
+        return self.fixed + self.var + self.childcare + self.housing
+
+
+def with_defaults(profiles, start_id=0):
+    """빠진 컬럼/값을 기본값으로 채운 프로필. household_id가 없으면 start_id부터 일련번호
+    (묶음으로 나눠 읽을 때는 앞 묶음까지의 행 수를 넘겨 전체 파일의 행 번호가 되게)"""
+    profiles = profiles.copy()
+    for col, default in DEFAULT_PROFILE.items():
+        if col not in profiles:
+            profiles[col] = default
+        else:
+            profiles[col] = profiles[col].fillna(default)
+    if "household_id" not in profiles:
+        profiles["household_id"] = np.arange(start_id, start_id + len(profiles))
+    return profiles
+
+
+def parse_children(column):
+    """'YYYY-MM;YYYY-MM' 문자열 열 → (출생연도, 출생월) 배열 (가구 × 최대 자녀 수)"""
+    plans = [
+        [tuple(int(v) for v in part.strip().split("-")) for part in str(cell).split(";") if part.strip()]
+        for cell in column
+    ]
+    n_max = max((len(p) for p in plans), default=0)
+    years = np.full((len(plans), n_max), NO_CHILD_YEAR)
+    months = np.ones((len(plans), n_max), dtype=int)
+    for h, plan in enumerate(plans):
+        for c, (y, m) in enumerate(plan):
+            years[h, c] = y
+            months[h, c] = m
+    return years, months
+
+
+def parse_amounts(column, width=None):
+    """'a;b;c' 문자열 열 → 가구 × 칸 배열 (빈 칸은 NaN, width가 없으면 가장 긴 행 길이)"""
+    rows = [[float(v) for v in str(cell).split(";") if v.strip()] for cell in column]
+    if width is None:
+        width = max((len(r) for r in rows), default=0)
+    amounts = np.full((len(rows), width), np.nan)
+    for h, row in enumerate(rows):
+        amounts[h, :len(row)] = row[:width]
+    return amounts
+
+
+def rate_paths(p, months):
+    """가구 × 월 연 금리(%) 경로: loan_rate에서 시작해 rate_changes 컬럼의 변경을 적용 (변경이 있는 가구만 rate_path)"""
+    rates = np.repeat(p["loan_rate"].to_numpy(dtype=float)[:, None], months, axis=1)
+    for h, (rate, cell) in enumerate(zip(p["loan_rate"], p["rate_changes"])):
+        changes = [part.strip().split(":") for part in str(cell).split(";") if part.strip()]
+        if changes:
+            rates[h] = rate_path(months, rate, [(int(m), float(r)) for m, r in changes])
+    return rates
+
+
+def parse_leaves(column):
+    """'소득자:YYYY-MM:개월;...' 문자열 열 → 휴직 창 배열 (가구 번호, 소득자 번호, 시작 연도, 시작 월, 개월 수)"""
+    rows = []
+    for h, cell in enumerate(column):
+        for part in str(cell).split(";"):
+            if part.strip():
+                who, start, n_months = part.strip().split(":")
+                year, month = start.split("-")
+                rows.append((h, EARNERS.index(who.strip()), int(year), int(month), int(n_months)))
+    return np.array(rows, dtype=int).reshape(-1, 5)
+
+
+def profile_leaves(p):
+    """hy_/wy_ 컬럼의 소득자별 휴직과 leaves 컬럼의 휴직을 합친 휴직 창 배열 (parse_leaves와 같은 열)"""
+    households = np.arange(len(p))
+    columns = [
+        np.column_stack([households, np.full(len(p), e)] + [
+            p[f"{prefix}_{col}"].to_numpy(dtype=int) for col in ("start_year", "start_month", "months")
+        ])
+        for e, prefix in enumerate(LEAVE_PREFIX)
+    ]
+    windows = np.concatenate(columns + [parse_leaves(p["leaves"])])
+    return windows[windows[:, 4] > 0]
+
+
+def project_households(profiles):
+    """프로필 DataFrame 전체를 한 번의 배열 계산으로 예측"""
+    p = with_defaults(profiles)
+    # 소득자별 마지막 근로 연도: {e}_last_year 컬럼이 있으면 그 값, 없으면 출생연도 + 은퇴 나이 - 1
+    last_years = []
+    for e in EARNERS:
+        derived = p[f"{e}_birth"] + p[f"{e}_retire_age"] - 1
+        last_years.append((p[f"{e}_last_year"].fillna(derived) if f"{e}_last_year" in p else derived).to_numpy())
+    last_year = np.maximum(*last_years).astype(int)
+    n_years = np.maximum(last_year - BASE_YEAR + 1, 1)
+    months = n_years * 12
+    n_months = int(months.max())
+    t = np.arange(n_months)
+
+    # 소득: 가구 × 소득자 × 월 (1~12월 세전 월급 × 연차 인상 배수, 월급 입력이 없으면 연봉 / 12)
+    annual = p[[f"{e}_annual" for e in EARNERS]].to_numpy(dtype=float)
+    base = np.stack([parse_amounts(p[f"{e}_gross"], 12) for e in EARNERS], axis=1)
+    base = np.where(np.isnan(base), annual[..., None] / 12, base)
+    rates = p[[f"{e}_rate" for e in EARNERS]].to_numpy(dtype=float)
+    gross = base[..., t % 12] * (1 + rates[..., None] / 100) ** (t // 12)
+    net = gross_to_net(gross)
+    # 육아휴직: 가구 × 소득자 행으로 펼쳐 앱과 같은 apply_leaves로 휴직 창들의 기간을 휴직 급여로 대체
+    # (시작 연도 규칙, 같은 가구의 부부가 가까이 휴직하면 특례, 겹치는 창은 큰 급여)
+    household, earner, start_year, start_month, length = profile_leaves(p).T
+    n_earners = len(EARNERS)
+    rows = (len(p) * n_earners, n_months)
+    net = apply_leaves(
+        net.reshape(rows), gross.reshape(rows), household * n_earners + earner,
+        (start_year - BASE_YEAR) * 12 + start_month - 1, length, start_year,
+        parse_amounts(p["custom_leave_pay"])[household], p["parents_bonus"].to_numpy(dtype=bool)[household],
+        households=household,
+    ).reshape(net.shape)
+
+    # 지출: 가구별 물가 배수 (가구 × 월)
+    inflation = p["inflation"].to_numpy(dtype=float)
+    factors = inflation_factors(n_months, inflation[:, None])
+    fixed = p["fixed_expense"].to_numpy(dtype=float)[:, None] * factors
+    var = p["var_expense"].to_numpy(dtype=float)[:, None] * factors
+    birth_years, birth_months = parse_children(p["children"])
+    childcare = childcare_costs(birth_years, birth_months, n_months, inflation[:, None], BASE_YEAR).sum(axis=1)
+
+    # 주거비: 집을 사면 대출 상환 스케줄 (앱과 같은 loan_schedule, 상환 방식별로 묶어 한 번씩), 아니면 물가 반영 월 주거비
+    need_loan = np.maximum(p["house_price"] - p["cash"], 0).to_numpy(dtype=float)
+    repayment = p["repayment"].to_numpy(dtype=str)
+    unknown = set(repayment) - set(REPAYMENT_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown repayment type: {', '.join(sorted(unknown))}")
+    rates = rate_paths(p, n_months)
+    term = p["loan_year"].to_numpy(dtype=int) * 12
+    grace = p["grace_months"].to_numpy(dtype=int)
+    payment = np.zeros((len(p), n_months))
+    balance = np.zeros((len(p), n_months))
+    for kind in REPAYMENT_TYPES:
+        rows = repayment == kind
+        if rows.any():
+            schedule = loan_schedule(need_loan[rows], rates[rows], term[rows], kind, grace[rows], months=n_months)
+            payment[rows], balance[rows] = schedule.payment, schedule.balance
+    owner = (p["house_price"].to_numpy() > 0)[:, None]
+    housing = np.where(owner, payment, p["housing_payment"].to_numpy(dtype=float)[:, None] * factors)
+
+    valid = t < months[:, None]
+    return HouseholdProjection(
+        months=months,
+        earner_net=np.where(valid[:, None], net, 0.0),
+        fixed=np.where(valid, fixed, 0.0),
+        var=np.where(valid, var, 0.0),
+        childcare=np.where(valid, childcare, 0.0),
+        housing=np.where(valid, housing, 0.0),
+        loan_balance=np.where(valid & owner, balance, 0.0),
+    )
+
+
+def ledger_frame(household_ids, proj):
+    """가구별 월별 장부 (long format, 유효 개월만)"""
+    n_months = proj.fixed.shape[1]
+    t = np.arange(n_months)
+    valid = t < proj.months[:, None]
+    income = proj.income
+    net = income - proj.expense
+    cols = {
+        "household_id": np.repeat(np.asarray(household_ids), n_months).reshape(-1, n_months),
+        "year": np.broadcast_to(BASE_YEAR + t // 12, valid.shape),
+        "month": np.broadcast_to(t % 12 + 1, valid.shape),
+        "husband_net": proj.earner_net[:, 0],
+        "wife_net": proj.earner_net[:, 1],
+        "income": income,
+        "fixed": proj.fixed,
+        "var": proj.var,
+        "childcare": proj.childcare,
+        "housing": proj.housing,
+        "expense": proj.expense,
+        "net": net,
+        "cumulative": np.cumsum(net, axis=1),
+    }
+    return pd.DataFrame({k: v[valid] for k, v in cols.items()})
+
+
+def summary_frame(household_ids, proj):
+    """가구별 연도별 요약 (소득/지출/순현금흐름/누적)"""
+    n_hh, n_months = proj.fixed.shape
+    n_years = n_months // 12
+    income = proj.income.reshape(n_hh, n_years, 12).sum(axis=2)
+    expense = proj.expense.reshape(n_hh, n_years, 12).sum(axis=2)
+    net = income - expense
+    valid = np.arange(n_years) < (proj.months // 12)[:, None]
+    cols = {
+        "household_id": np.repeat(np.asarray(household_ids), n_years).reshape(-1, n_years),
+        "year": np.broadcast_to(BASE_YEAR + np.arange(n_years), valid.shape),
+        "income": income,
+        "expense": expense,
+        "net": net,
+        "cumulative": np.cumsum(net, axis=1),
+    }
+    return pd.DataFrame({k: v[valid] for k, v in cols.items()})
+
+
+def read_profiles(path, chunk_size):
+    """입력 파일을 chunk_size 가구씩 DataFrame으로 읽기 (CSV/Parquet)"""
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet 입력에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class _Writer:
+    """묶음별 DataFrame을 한 파일에 이어 쓰기"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._parquet = None
+        self._first = True
+
+    def write(self, df):
+        if self.fmt == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise SystemExit("Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow)")
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def run(path, out_dir, chunk_size=1000, fmt="csv"):
+    """전체 입력을 묶음별로 예측해 out_dir에 ledger/summary 파일로 저장. 처리한 가구 수 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    ledger = _Writer(os.path.join(out_dir, f"ledger.{fmt}"), fmt)
+    summary = _Writer(os.path.join(out_dir, f"summary.{fmt}"), fmt)
+    n_done = 0
+    try:
+        for chunk in read_profiles(path, chunk_size):
+            profiles = with_defaults(chunk, start_id=n_done)
+            proj = project_households(profiles)
+            ids = profiles["household_id"].to_numpy()
+            ledger.write(ledger_frame(ids, proj))
+            summary.write(summary_frame(ids, proj))
+            n_done += len(profiles)
+    finally:
+        ledger.close()
+        summary.close()
+    return n_done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m engine.batch", description="가구 프로필 일괄 예측")
+    parser.add_argument("profiles", help="입력 CSV 또는 Parquet 파일")
+    parser.add_argument("--out-dir", default="batch_out", help="결과 폴더 (기본: batch_out)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="한 번에 계산할 가구 수")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="출력 형식")
+    args = parser.parse_args(argv)
+    n = run(args.profiles, args.out_dir, args.chunk_size, args.format)
+    print(f"{n:,} households → {args.out_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
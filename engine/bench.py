@@ -0,0 +1,204 @@
+# 계산 경로별 벤치마크: 기간(10~80년) · 자녀 수 · 가구 묶음 크기를 바꿔 가며 측정
+#
+#   python -m engine.bench [--out bench.json] [--baseline bench_baseline.json] [--save-baseline]
+#                          [--only salary,leave] [--tolerance 0.2] [--fail-on-regression]
+#
+# 결과는 JSON 파일로 저장하고, 기준(baseline) 파일이 있으면 케이스별 배율(현재/기준)을 출력한다.
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from .batch import project_households
+from .budget import build_expenses
+from .childcare import get_childcare_cost
+from .income import gross_to_net, project_gross
+from .leave import apply_leaves
+from .loan import REPAYMENT_TYPES, loan_schedule, rate_path
+from .pipeline import cashflow_node
+from .timeline import timeline
+
+BASE_YEAR = 2024
+HORIZONS = (10, 20, 40, 80)
+CHILD_COUNTS = (0, 1, 3, 6)
+BATCH_SIZES = (1, 100, 1000)
+RATE_TYPES = ("fixed", "stepped")
+DEFAULT_BASELINE = "bench_baseline.json"
+
+FIXED = {"관리비": 25, "통신비": 15, "보험료": 40, "교통비": 20, "구독료": 5, "경조사비": 20}
+VAR = {"식비": 20, "외식": 5, "생활용품": 8}
+
+
+def _child_plan(n):
+    return [(BASE_YEAR + 1 + 2 * i, 3) for i in range(n)]
+
+
+def bench_salary(years):
+    base = [[400] * 12, [300] * 12]
+    return lambda: gross_to_net(project_gross(base, [3.5, 3.5], years))
+
+
+def bench_leave(years):
+    """앱과 같은 경로: 부부 각자 휴직 창 (부모 동반 특례 대상) → 규칙 표로 휴직 급여 대체"""
+    gross = project_gross([[400] * 12, [300] * 12], [3.5, 3.5], years)
+    net = gross_to_net(gross)
+    earners, starts, lengths = np.array([0, 1]), np.array([24, 27]), np.array([6, 12])
+    start_years = BASE_YEAR + starts // 12
+    return lambda: apply_leaves(net, gross, earners, starts, lengths, start_years)
+
+
+def bench_childcare(years, children):
+    plan = _child_plan(children)
+    births = np.array(plan, dtype=int).reshape(-1, 2)
+    return lambda: get_childcare_cost(births[:, 0], births[:, 1], years * 12, 2.2, BASE_YEAR)
+
+
+def bench_expense(years, children):
+    plan = _child_plan(children)
+    return lambda: build_expenses(FIXED, VAR, 130, plan, years * 12, 2.2, BASE_YEAR)
+
+
+def bench_loan(years, repayment, rates):
+    """앱 대출 노드와 같은 경로: 금리 경로(고정 / 3년마다 0.25%p 계단) → 상환 방식별 스케줄 (1년 거치)"""
+    months = max(years, 30) * 12
+    changes = [(m, 3.8 + 0.25 * i) for i, m in enumerate(range(36, 360, 36), 1)] if rates == "stepped" else ()
+    path = rate_path(months, 3.8, changes)
+    return lambda: loan_schedule(50000, path, 360, repayment, 12, months=months)
+
+
+def bench_aggregation(years):
+    """통합 페이지 연도별 집계 (앱과 같은 경로: cashflow_node → Timeline.yearly → 누적)"""
+    gross = project_gross([[400] * 12, [300] * 12], [3.5, 3.5], years)
+    net = gross_to_net(gross)
+    budget = build_expenses(FIXED, VAR, 130, _child_plan(2), years * 12, 2.2, BASE_YEAR)
+    tl = timeline(BASE_YEAR, BASE_YEAR + years - 1)
+
+    def run():
+        flow = cashflow_node(net, budget)
+        net_annual = tl.yearly(flow["net"])
+        return tl.yearly(flow["income"]), tl.yearly(flow["expense"]), net_annual, np.cumsum(net_annual)
+    return run
+
+
+def bench_batch(households, years):
+    rng = np.random.default_rng(0)
+    profiles = pd.DataFrame({
+        "husband_annual": rng.integers(3000, 9000, households),
+        "wife_annual": rng.integers(2000, 7000, households),
+        "husband_birth": BASE_YEAR + years - 60,
+        "wife_birth": BASE_YEAR + years - 60,
+        "children": ["2025-03;2027-06"] * households,
+        "house_price": rng.integers(0, 2, households) * 80000,
+        "cash": 30000,
+    })
+    return lambda: project_households(profiles)
+
+
+# 케이스 이름 → (측정 함수, 파라미터 격자)
+CASES = {
+    "salary": (bench_salary, {"years": HORIZONS}),
+    "leave": (bench_leave, {"years": HORIZONS}),
+    "childcare": (bench_childcare, {"years": HORIZONS, "children": CHILD_COUNTS}),
+    "expense": (bench_expense, {"years": HORIZONS, "children": CHILD_COUNTS}),
+    "loan": (bench_loan, {"years": HORIZONS, "repayment": REPAYMENT_TYPES, "rates": RATE_TYPES}),
+    "aggregation": (bench_aggregation, {"years": HORIZONS}),
+    "batch": (bench_batch, {"households": BATCH_SIZES, "years": (20, 40)}),
+}
+
+
+def case_key(name, params):
+    return name + "[" + ",".join(f"{k}={v}" for k, v in sorted(params.items())) + "]"
+
+
+def time_call(fn, repeat=5, min_time=0.05):
+    """1회 호출 시간(초): min_time 이상 걸리는 반복 횟수로 repeat번 재서 최솟값"""
+    timer = timeit.Timer(fn)
+    number, elapsed = 1, timer.timeit(1)
+    if elapsed < min_time:
+        number = max(int(min_time / max(elapsed, 1e-9)), 1)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(only=None, repeat=5):
+    """전체(또는 only 케이스) 측정 결과 list"""
+    results = []
+    for name, (make, grid) in CASES.items():
+        if only and name not in only:
+            continue
+        keys = list(grid)
+        for values in product(*(grid[k] for k in keys)):
+            params = dict(zip(keys, values))
+            seconds = time_call(make(**params), repeat=repeat)
+            results.append({"case": name, "params": params, "key": case_key(name, params), "seconds": seconds})
+            print(f"{case_key(name, params):<56} {seconds * 1e6:12.1f} µs", file=sys.stderr)
+    return results
+
+
+def report(results):
+    """환경 정보를 붙인 결과 문서"""
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance=0.2):
+    """케이스별 (key, 기준 초, 현재 초, 배율, 회귀 여부). 기준에 없는 케이스는 제외"""
+    base = {r["key"]: r["seconds"] for r in baseline["results"]}
+    rows = []
+    for r in results:
+        if r["key"] in base:
+            ratio = r["seconds"] / base[r["key"]]
+            rows.append((r["key"], base[r["key"]], r["seconds"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m engine.bench", description="계산 경로별 벤치마크")
+    parser.add_argument("--out", default="bench.json", help="결과 JSON 파일 (기본: bench.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="비교할 기준 JSON 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준 파일로 저장")
+    parser.add_argument("--only", default="", help="측정할 케이스 (쉼표 구분): " + ",".join(CASES))
+    parser.add_argument("--repeat", type=int, default=5, help="케이스별 반복 측정 횟수")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 볼 느려짐 비율 (기본 0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    only = {c for c in args.only.split(",") if c}
+    unknown = only - set(CASES)
+    if unknown:
+        parser.error(f"알 수 없는 케이스: {', '.join(sorted(unknown))}")
+    doc = report(run(only, args.repeat))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2, ensure_ascii=False)
+        print(f"baseline saved → {args.baseline}", file=sys.stderr)
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"no baseline at {args.baseline} (--save-baseline으로 생성)", file=sys.stderr)
+        return 0
+    rows = compare(doc["results"], baseline, args.tolerance)
+    for key, before, after, ratio, slower in rows:
+        print(f"{key:<56} {before * 1e6:10.1f} → {after * 1e6:10.1f} µs  x{ratio:5.2f}{'  REGRESSION' if slower else ''}")
+    regressions = sum(row[4] for row in rows)
+    print(f"{len(rows)} cases compared, {regressions} regression(s)", file=sys.stderr)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# 가계부(고정비/변동비/육아비/주거비) 월별 배열 계산
+import numpy as np
+
+from .childcare import childcare_costs
+
+# 항목 그룹 순서 (group_totals 결과의 행 순서)
+EXPENSE_GROUPS = ("fixed", "var", "housing")
+
+
+def inflation_factors(months, inflation):
+    """월별 물가 배수 (연 단위 계단식, 첫 해 1.0)"""
+    return (1 + inflation / 100) ** (np.arange(months) // 12)
+
+
+def expense_matrix(amounts, factors):
+    """항목 × 월 지출 행렬: 항목 벡터(items × 1)와 물가 배수의 outer product"""
+    return np.asarray(amounts, dtype=float)[:, None] * factors[None, :]
+
+
+def group_totals(matrix, groups, n_groups):
+    """항목 × 월 행렬을 그룹별로 합산 (n_groups × 월)"""
+    onehot = np.asarray(groups)[None, :] == np.arange(n_groups)[:, None]
+    return onehot.astype(float) @ matrix
+
+
+def build_expenses(fixed_expenses, var_expenses, housing_payment, child_plan, months_sim, inflation,
+                   base_year=2024, housing_schedule=None):
+    """항목별 월 지출 배열 dict (fixed/var/childcare/housing/total).
+    housing_schedule(대출 월 상환액 배열)이 있으면 주거비는 물가 반영 없이 그 값을 그대로 사용"""
+    amounts = [*fixed_expenses.values(), *var_expenses.values(), housing_payment]
+    groups = [0] * len(fixed_expenses) + [1] * len(var_expenses) + [2]
+    factors = inflation_factors(months_sim, inflation)
+    fixed_arr, var_arr, housing_arr = group_totals(
+        expense_matrix(amounts, factors), groups, len(EXPENSE_GROUPS)
+    )
+    if housing_schedule is not None:
+        n = min(len(housing_schedule), months_sim)
+        housing_arr = np.zeros(months_sim)
+        housing_arr[:n] = housing_schedule[:n]
+    # 육아비
+    childcare_arr = np.zeros(months_sim)
+    if child_plan:
+        # (출생연도, 출생월) 목록 → 자녀 × 월 배열을 한 번에 계산해 합산
+        birth = np.asarray(child_plan)
+        childcare_arr += childcare_costs(birth[:, 0], birth[:, 1], months_sim, inflation, base_year).sum(axis=0)
+
+    total_arr = fixed_arr + var_arr + childcare_arr + housing_arr
+    return {
+        "fixed": fixed_arr,
+        "var": var_arr,
+        "childcare": childcare_arr,
+        "housing": housing_arr,
+        "total": total_arr,
+    }
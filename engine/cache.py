@@ -0,0 +1,110 @@
+# 입력 지문(hash) 기반 계산 결과 캐시
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _feed(h, obj):
+    """obj를 타입별로 일정한 바이트열로 hash에 넣기"""
+    if isinstance(obj, np.ndarray):
+        h.update(b"nd" + str(obj.dtype).encode() + str(obj.shape).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            _feed(h, k)
+            _feed(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"(" + type(obj).__name__.encode())
+        for v in obj:
+            _feed(h, v)
+        h.update(b")")
+    else:
+        h.update(type(obj).__name__.encode() + repr(obj).encode())
+
+
+def fingerprint(*args, **kwargs):
+    """인자 전체의 지문(16진수 문자열)"""
+    h = hashlib.blake2b(digest_size=16)
+    _feed(h, args)
+    _feed(h, kwargs)
+    return h.hexdigest()
+
+
+def _freeze(obj):
+    """캐시에 보관하는 배열은 읽기 전용으로 (호출자가 실수로 바꾸지 못하게)"""
+    if isinstance(obj, np.ndarray):
+        obj.setflags(write=False)
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            _freeze(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            _freeze(v)
+    return obj
+
+
+class LRUCache:
+    """크기 제한 LRU 캐시 (가장 오래 안 쓴 항목부터 제거).
+    모듈 전역으로 두고 모든 세션 스레드가 함께 쓰므로 조회·추가·제거는 잠금 안에서"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+_MISSING = object()
+
+
+def memoize(maxsize=64):
+    """입력 지문을 키로 결과를 LRU 캐시에 보관하는 데코레이터 (결과 배열은 읽기 전용)"""
+    def decorator(fn):
+        cache = LRUCache(maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = fingerprint(*args, **kwargs)
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = _freeze(fn(*args, **kwargs))
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
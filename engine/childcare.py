@@ -0,0 +1,30 @@
+# 육아비 계산
+import numpy as np
+
+# 연령 구간표: 구간 시작 나이(개월)와 월 기준 육아비(만원), 마지막 경계 이후(만 23세~)는 0
+CHILDCARE_BANDS = (
+    (0, 36, 84, 156, 228, 276),   # 0~2세 / 3~6세 / 7~12세 / 13~18세 / 19~22세(대학생) / 종료
+    (60, 80, 100, 140, 180),
+)
+
+
+def childcare_costs(birth_years, birth_months, months, inflation=2.2, base_year=2024, bands=CHILDCARE_BANDS):
+    """자녀별 월 육아비 배열 (자녀 shape × months).
+    birth_years/birth_months는 같은 shape의 배열(출생월 1~12), inflation은 자녀 shape와 broadcast 가능한 배열
+    (예: 시나리오 × 1)이면 시나리오 축까지 한 번에 계산"""
+    edges = np.asarray(bands[0])
+    table = np.append(np.asarray(bands[1], dtype=float), 0.0)
+    t = np.arange(months)
+    # 자녀의 만 나이 (개월)
+    age_month = ((base_year - np.asarray(birth_years)[..., None]) * 12
+                 + t + 1 - np.asarray(birth_months)[..., None])
+    band = np.searchsorted(edges, age_month, side="right") - 1
+    base = np.where(age_month >= 0, table[np.clip(band, 0, len(table) - 1)], 0.0)
+    # 인플레이션 반영(기준은 '현재년도-base_year')
+    factor = (1 + np.asarray(inflation, dtype=float)[..., None] / 100) ** (t // 12)
+    return base * factor
+
+
+def get_childcare_cost(start_year, start_month, months, inflation=2.2, base_year=2024):
+    """출생연도·월부터 22세까지, 연령별로 차등. start_month는 1~12"""
+    return childcare_costs(start_year, start_month, months, inflation, base_year)
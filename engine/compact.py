@@ -0,0 +1,46 @@
+# 세션 보관용 배열 압축: 실수 배열은 연속 float32로, 컨테이너는 재귀 변환
+from functools import lru_cache
+
+import numpy as np
+
+STORE_DTYPE = np.float32
+
+
+def compact(value):
+    """실수 배열은 float32 연속 배열로 (이미 float32면 복사 없이 그대로), 그 외 값은 유지"""
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f":
+            return np.ascontiguousarray(value, dtype=STORE_DTYPE)
+        return value
+    if isinstance(value, dict):
+        return {k: compact(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        items = [compact(v) for v in value]
+        return type(value)(*items) if hasattr(value, "_fields") else tuple(items)
+    if isinstance(value, list):
+        return [compact(v) for v in value]
+    return value
+
+
+def nbytes(value, _seen=None):
+    """값에 들어 있는 배열들의 총 바이트 수 (같은 배열은 한 번만)"""
+    seen = set() if _seen is None else _seen
+    if isinstance(value, np.ndarray):
+        base = value if value.base is None else value.base
+        if id(base) in seen:
+            return 0
+        seen.add(id(base))
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(nbytes(v, seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v, seen) for v in value)
+    return 0
+
+
+@lru_cache(maxsize=32)
+def shared_years(start_year, end_year):
+    """연도 배열 (같은 구간이면 모든 세션이 같은 읽기 전용 배열을 공유)"""
+    years = np.arange(start_year, end_year + 1, dtype=np.int64)
+    years.setflags(write=False)
+    return years
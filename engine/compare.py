@@ -0,0 +1,89 @@
+# 시나리오 여러 개를 한 배치로 계산해 연도별로 비교
+#
+# 각 시나리오의 계산 그래프 입력을 배치 프로필 한 행(1~12월 세전 월급, 휴직 창 목록, 수동 휴직 급여, 대출 상품 포함)으로
+# 바꿔 project_households에 한 번에 넣고, 순자산은 앱과 같은 net_worth로 시나리오별 계좌 설정을 적용한다.
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import BASE_YEAR, EARNERS, project_households
+from .loan import ANNUITY
+from .networth import DEFAULT_ACCOUNTS, Account, net_worth
+from .pipeline import leave_windows
+
+
+class Comparison(NamedTuple):
+    """시나리오 × 연도 배열 모음 (은퇴 이후 연도는 valid가 False)"""
+    years: np.ndarray
+    valid: np.ndarray
+    income: np.ndarray
+    expense: np.ndarray
+    net: np.ndarray
+    cumulative: np.ndarray     # 누적 순현금흐름
+    net_assets: np.ndarray     # 순자산 = 현금 + 계좌 세후 평가액 + 집값 - 대출 잔액 (연말 기준)
+
+
+def scenario_profile(inputs):
+    """계산 그래프 입력 dict → 배치 프로필 한 행 (dict)"""
+    row = {}
+    income = inputs["income_inputs"]
+    for e, base, rate, last_year in zip(EARNERS, income["base_gross"], income["rates"], inputs["last_years"]):
+        row[f"{e}_annual"] = float(np.sum(base))
+        row[f"{e}_gross"] = ";".join(str(float(v)) for v in np.ravel(base))
+        row[f"{e}_rate"] = rate
+        row[f"{e}_last_year"] = last_year
+    leave = inputs.get("leave_inputs", {})
+    windows = leave_windows(leave.get("leaves", []))
+    row["leaves"] = ";".join(f"{EARNERS[e]}:{y}-{m:02d}:{n}" for e, y, m, n in windows.tolist() if n > 0)
+    row["parents_bonus"] = leave.get("parents_bonus", True)
+    row["custom_leave_pay"] = ";".join(str(float(v)) for v in leave.get("custom_leave_pay") or ())
+    budget = inputs.get("budget_inputs", {})
+    row["fixed_expense"] = float(sum(budget.get("fixed", {}).values()))
+    row["var_expense"] = float(sum(budget.get("var", {}).values()))
+    row["inflation"] = inputs.get("inflation", 2.2)
+    row["children"] = ";".join(f"{y}-{m}" for y, m in inputs.get("children", []))
+    loan = inputs.get("loan_inputs")
+    if loan is not None:
+        row.update(house_price=loan["price"], cash=loan["cash"], loan_rate=loan["loan_rate"],
+                   loan_year=loan["loan_year"], house_growth=loan.get("up_rate", 0.0),
+                   repayment=loan.get("repayment", ANNUITY), grace_months=loan.get("grace_months", 0),
+                   rate_changes=";".join(f"{int(m)}:{float(r)}" for m, r in loan.get("rate_changes", ())))
+    else:
+        row.update(house_price=0, house_growth=0.0, housing_payment=inputs.get("housing_payment") or 0)
+    return row
+
+
+def compare_scenarios(inputs_list):
+    """시나리오 입력 목록을 한 배치로 계산한 Comparison"""
+    profiles = pd.DataFrame([scenario_profile(i) for i in inputs_list])
+    proj = project_households(profiles)
+    n, n_months = proj.fixed.shape
+    n_years = n_months // 12
+    income = proj.income.reshape(n, n_years, 12).sum(axis=2)
+    expense = proj.expense.reshape(n, n_years, 12).sum(axis=2)
+    net = income - expense
+    cumulative = np.cumsum(net, axis=1)
+    # 순자산: 시나리오마다 계좌 설정이 달라 net_worth를 시나리오별로 (집은 시작 시점 구입, 잔액은 월별)
+    net_monthly = proj.income - proj.expense
+    growth = profiles["house_growth"].fillna(0.0).to_numpy(dtype=float)
+    price = profiles["house_price"].to_numpy(dtype=float)
+    total = np.stack([
+        net_worth(net_monthly[i], [Account(*a) for a in inputs.get("accounts", DEFAULT_ACCOUNTS)],
+                  price[i], growth[i], proj.loan_balance[i]).total
+        for i, inputs in enumerate(inputs_list)
+    ]) if n else np.zeros((0, n_months))
+    return Comparison(
+        years=BASE_YEAR + np.arange(n_years),
+        valid=np.arange(n_years) < (proj.months // 12)[:, None],
+        income=income,
+        expense=expense,
+        net=net,
+        cumulative=cumulative,
+        net_assets=total[:, 11::12],
+    )
+
+
+def deltas(values, baseline):
+    """시나리오 × 연도 값에서 baseline 행을 뺀 차이"""
+    return values - values[baseline]
@@ -0,0 +1,101 @@
+# 의존성 추적 계산 그래프: 입력이 바뀌면 그 하위 노드만 dirty로 표시하고, 값을 요청할 때 필요한 것만 재계산
+from collections import defaultdict
+from contextlib import nullcontext
+
+from .cache import fingerprint
+
+_MISSING = object()
+
+
+class Graph:
+    """이름 붙은 입력과 계산 노드의 DAG"""
+
+    def __init__(self, store=None):
+        self._store = store or (lambda value: value)  # 노드 값을 보관 형태로 바꾸는 함수 (예: compact)
+        self._fns = {}                     # 노드 이름 -> (함수, 입력 이름 목록)
+        self._inputs = {}                  # 입력 이름 -> 값
+        self._keys = {}                    # 입력 이름 -> 값 지문 (변경 감지)
+        self._values = {}                  # 노드 이름 -> 마지막 계산 값
+        self._dirty = set()
+        self._children = defaultdict(set)
+        self.recomputed = []               # 최근 get 호출들에서 다시 계산한 노드 (계측용)
+        self.trace = lambda name: nullcontext()  # 노드 계산 구간 계측 훅 (예: SpanRecorder.span)
+
+    def add_input(self, name, default=_MISSING):
+        self._fns.pop(name, None)
+        if default is not _MISSING:
+            self.set(name, default)
+        return self
+
+    def add_node(self, name, fn, inputs):
+        """fn(*[inputs 값])으로 계산되는 노드 (입력/노드 이름은 먼저 선언되어 있어야 함)"""
+        self._fns[name] = (fn, tuple(inputs))
+        for dep in inputs:
+            self._children[dep].add(name)
+        self._dirty.add(name)
+        return self
+
+    def set(self, name, value):
+        """입력 값 설정. 값이 실제로 바뀐 경우에만 하위 노드를 무효화하고 True 반환"""
+        key = fingerprint(value)
+        if self._keys.get(name) == key:
+            return False
+        self._inputs[name] = value
+        self._keys[name] = key
+        self._invalidate(name)
+        return True
+
+    def _invalidate(self, name):
+        stack = [name]
+        while stack:
+            for child in self._children[stack.pop()]:
+                if child not in self._dirty:
+                    self._dirty.add(child)
+                    stack.append(child)
+
+    def is_set(self, name):
+        return name in self._inputs
+
+    def input(self, name, default=None):
+        return self._inputs.get(name, default)
+
+    def ready(self, name):
+        """name 계산에 필요한 입력이 모두 설정되었는지"""
+        if name not in self._fns:
+            return name in self._inputs
+        return all(self.ready(dep) for dep in self._fns[name][1])
+
+    def is_dirty(self, name):
+        return name in self._dirty or name not in self._values
+
+    def get(self, name):
+        """입력 값 또는 (필요하면 재계산한) 노드 값"""
+        if name not in self._fns:
+            if name not in self._inputs:
+                raise KeyError(f"입력 '{name}'이(가) 설정되지 않았습니다")
+            return self._inputs[name]
+        if self.is_dirty(name):
+            fn, deps = self._fns[name]
+            args = [self.get(dep) for dep in deps]
+            with self.trace(f"compute:{name}"):
+                self._values[name] = self._store(fn(*args))
+            self._dirty.discard(name)
+            self.recomputed.append(name)
+        return self._values[name]
+
+    def values(self):
+        """계산 완료된 노드 값 dict"""
+        return {k: v for k, v in self._values.items() if k not in self._dirty}
+
+    def snapshot(self):
+        """(입력 dict, 계산 완료된 노드 값 dict)"""
+        return dict(self._inputs), self.values()
+
+    def restore(self, inputs, values):
+        """snapshot 결과로 되돌리기 (저장된 노드 값은 재계산 없이 사용)"""
+        for name, value in inputs.items():
+            self.set(name, value)
+        for name, value in values.items():
+            if name in self._fns:
+                self._values[name] = self._store(value)
+                self._dirty.discard(name)
@@ -0,0 +1,39 @@
+# 소득(세전→세후, 연봉 인상) 계산
+import numpy as np
+
+from .payroll import net_pay, net_to_gross
+
+
+def calc_net_salary_from_gross(gross):
+    return int(gross_to_net(gross))
+
+def gross_to_net_list(gross_list):
+    return [calc_net_salary_from_gross(g) for g in gross_list]
+
+def monthly_net_from_annual(annual_gross):
+    monthly_gross = annual_gross / 12
+    net = calc_net_salary_from_gross(monthly_gross)
+    return [net] * 12
+
+
+def raise_factors(rates, n_years):
+    """소득자별 연차 인상 배수 (earners × years) = (1+rate)^연차"""
+    rates = np.atleast_1d(np.asarray(rates, dtype=float))
+    return (1 + rates[:, None] / 100) ** np.arange(n_years)
+
+
+def project_gross(base_gross, rates, n_years):
+    """12개월 기준 세전 월급(earners × 12)을 연차별 인상 적용해 (earners × months) 배열로"""
+    base = np.atleast_2d(np.asarray(base_gross, dtype=float))
+    factors = raise_factors(rates, n_years)
+    return (factors[:, :, None] * base[:, None, :]).reshape(base.shape[0], -1)
+
+
+def gross_to_net(gross):
+    """세전 → 세후 (4대 보험·소득세·지방소득세 공제, calc_net_salary_from_gross 배열 버전, 만원 미만 절사)"""
+    return np.floor(net_pay(gross) + 1e-6)  # 세후 입력을 역산한 세전이 다시 같은 세후가 되도록 부동소수 오차 보정
+
+
+def net_to_gross_list(net_list):
+    """월 세후 입력 목록 → 월 세전 목록 (gross_to_net 역산, 절사 전 기준)"""
+    return net_to_gross(net_list).tolist()
@@ -0,0 +1,152 @@
+# 육아휴직 급여 계산 (제도별 규칙 표 기반)
+#
+# 휴직 시작 연도에 시행 중인 규칙(LEAVE_RULES)으로 급여를 정한다. 부부가 서로 가까운 시기에 휴직하면
+# 부모 동반 휴직 특례(3+3, 6+6)의 첫 N개월 상한을 적용한다. 규칙은 (규칙 × 구간) 배열로 펼쳐 두고
+# 휴직 창 × 월 배열 전체에 한 번에 적용하므로 휴직 계획이 복잡해도 월 단위 파이썬 반복이 없다.
+from typing import NamedTuple
+
+import numpy as np
+
+
+class LeaveRule(NamedTuple):
+    """since 연도부터 시작한 휴직에 적용하는 급여 규칙 (금액 만원/월)"""
+    since: int
+    tier_starts: tuple   # 구간 시작 (휴직 몇 번째 달부터, 0부터)
+    tier_ratios: tuple   # 세전 월급 대비 지급 비율
+    tier_caps: tuple     # 상한
+    floor: float         # 하한
+    bonus_caps: tuple    # 부모 동반 휴직 특례: 첫 N개월은 세전 월급 100%, 달마다 이 상한
+    bonus_window: int    # 부부 휴직 시작 간격이 이 개월 수 이내면 특례 대상
+
+
+LEAVE_RULES = (
+    LeaveRule(2022, (0,), (0.8,), (150,), 70, (200, 250, 300), 12),                             # 3+3
+    LeaveRule(2024, (0,), (0.8,), (150,), 70, (200, 250, 300, 350, 400, 450), 18),              # 6+6
+    LeaveRule(2025, (0, 3, 6), (1.0, 1.0, 0.8), (250, 200, 160), 70, (250, 250, 300, 350, 400, 450), 18),
+)
+
+_TABLES = {}
+
+
+def rule_tables(rules=LEAVE_RULES):
+    """규칙 목록 → 구간/특례 표 dict (규칙 × 구간 배열, 짧은 규칙은 채움값으로 패딩)"""
+    key = id(rules)
+    if key not in _TABLES:
+        n_tier = max(len(r.tier_starts) for r in rules)
+        n_bonus = max(len(r.bonus_caps) for r in rules)
+
+        def pad(rows, width, fill):
+            return np.array([tuple(row) + (fill,) * (width - len(row)) for row in rows], dtype=float)
+
+        _TABLES[key] = (rules, {
+            "since": np.array([r.since for r in rules]),
+            "starts": pad([r.tier_starts for r in rules], n_tier, np.inf),
+            "ratios": pad([r.tier_ratios for r in rules], n_tier, 0.0),
+            "caps": pad([r.tier_caps for r in rules], n_tier, 0.0),
+            "floor": np.array([r.floor for r in rules], dtype=float),
+            "bonus_caps": pad([r.bonus_caps for r in rules], n_bonus, 0.0),
+            "bonus_len": np.array([len(r.bonus_caps) for r in rules]),
+            "bonus_window": np.array([r.bonus_window for r in rules]),
+        })
+    return _TABLES[key][1]
+
+
+def rule_index(start_year, rules=LEAVE_RULES):
+    """휴직 시작 연도에 시행 중인 규칙 번호 (첫 규칙 이전 연도는 첫 규칙)"""
+    since = rule_tables(rules)["since"]
+    return np.maximum(np.searchsorted(since, np.asarray(start_year), side="right") - 1, 0)
+
+
+def leave_pay(gross, idx, rule, bonus=False, custom_leave_pay=None, rules=LEAVE_RULES):
+    """휴직 idx번째 달(0부터) 급여. gross/idx/rule(규칙 번호)/bonus(특례 여부)는 broadcast 가능한 배열.
+    custom_leave_pay가 있으면 그 길이만큼은 수동 입력값 우선. 2차원 (창 × 개월)이면 창별 수동 입력이고
+    NaN 칸은 자동 계산"""
+    tab = rule_tables(rules)
+    gross = np.asarray(gross, dtype=float)
+    idx = np.asarray(idx)
+    rule = np.asarray(rule)
+    tier = (idx[..., None] >= tab["starts"][rule]).sum(axis=-1) - 1
+    pay = np.maximum(
+        np.minimum(gross * tab["ratios"][rule, tier], tab["caps"][rule, tier]), tab["floor"][rule]
+    )
+    in_bonus = np.asarray(bonus) & (idx < tab["bonus_len"][rule])
+    if in_bonus.any():
+        bonus_cap = tab["bonus_caps"][rule, np.minimum(idx, tab["bonus_caps"].shape[1] - 1)]
+        pay = np.where(in_bonus, np.minimum(gross, bonus_cap), pay)
+    pay = np.floor(pay + 1e-6)  # 세전이 float32로 저장된 경로와 같은 만원 단위가 되도록 부동소수 오차 보정
+    if custom_leave_pay is not None and np.size(custom_leave_pay):
+        custom = np.asarray(custom_leave_pay, dtype=float)
+        n = custom.shape[-1]
+        pos = np.clip(idx, 0, n - 1)
+        manual = custom[pos] if custom.ndim == 1 else np.take_along_axis(custom, pos, axis=-1)
+        pay = np.where((idx < n) & ~np.isnan(manual), manual, pay)
+    return pay
+
+
+def parents_bonus(earners, starts, lengths, rule, rules=LEAVE_RULES, households=None):
+    """휴직 창별 특례 대상 여부: 다른 소득자의 휴직이 bonus_window 개월 이내에 시작하면 True.
+    households(창별 가구 번호)가 있으면 같은 가구의 창끼리만 비교 (가구 × 가구당 창 × 창 배열)"""
+    earners, starts, lengths = (np.asarray(a).reshape(-1) for a in (earners, starts, lengths))
+    window = rule_tables(rules)["bonus_window"][np.asarray(rule).reshape(-1)]
+    households = np.zeros(len(earners), dtype=int) if households is None else np.asarray(households).reshape(-1)
+    # 가구별로 창을 모아 (가구, 가구 안 순번) 칸에 놓고 빈 칸은 길이 0 (비교 대상 아님)
+    order = np.argsort(households, kind="stable")
+    sorted_households = households[order]
+    group = np.unique(sorted_households, return_inverse=True)[1]
+    slot = np.arange(len(order)) - np.searchsorted(sorted_households, sorted_households)
+    shape = (group.max() + 1, slot.max() + 1) if len(order) else (0, 0)
+    grid = {}
+    for name, values in (("earner", earners), ("start", starts), ("length", lengths), ("window", window)):
+        grid[name] = np.zeros(shape, dtype=values.dtype)
+        grid[name][group, slot] = values[order]
+    near = np.abs(grid["start"][:, :, None] - grid["start"][:, None, :]) <= grid["window"][:, :, None]
+    other = (grid["earner"][:, :, None] != grid["earner"][:, None, :]) & (grid["length"][:, None, :] > 0)
+    eligible = np.empty(len(order), dtype=bool)
+    eligible[order] = (near & other).any(axis=2)[group, slot]
+    return eligible & (lengths > 0)
+
+
+def apply_leaves(net, gross, earners, starts, lengths, start_years, custom_leave_pay=None, bonus=True,
+                 rules=LEAVE_RULES, households=None):
+    """소득자 × 월 세후 소득(net)에서 휴직 창들의 기간을 휴직 급여로 대체한 새 배열.
+    휴직 창 W개는 (소득자 번호, 시작 월 인덱스, 개월 수, 시작 연도) 배열로 받고,
+    같은 소득자의 창이 겹치면 더 큰 급여를 쓴다. 여러 가구를 한 번에 계산할 때는 net/gross 행을
+    가구 × 소득자로 펼쳐 넘기고 households(창별 가구 번호)로 특례 비교 범위를 가구 안으로 제한.
+    bonus는 전체 또는 창별 특례 적용 여부"""
+    earners, starts, lengths = (np.asarray(a, dtype=int).reshape(-1) for a in (earners, starts, lengths))
+    if not len(earners):
+        return net
+    t = np.arange(net.shape[1])
+    idx = t[None, :] - starts[:, None]                             # 창 × 월
+    active = (idx >= 0) & (idx < lengths[:, None])
+    rule = rule_index(start_years, rules).reshape(-1)
+    eligible = parents_bonus(earners, starts, lengths, rule, rules, households) & np.asarray(bonus, dtype=bool)
+    pay = leave_pay(gross[earners], np.maximum(idx, 0), rule[:, None], eligible[:, None], custom_leave_pay, rules)
+    # 창별 급여를 소득자 행으로 모으며 겹치는 달은 큰 값 (휴직이 아닌 달은 -inf로 남음)
+    paid = np.full(net.shape, -np.inf)
+    np.maximum.at(paid, earners, np.where(active, pay, -np.inf))
+    return np.where(paid > -np.inf, paid, net)
+
+
+def parental_leave_pay(gross, idx, custom_leave_pay=None, year=None):
+    """휴직 idx번째 달 급여 배열 (특례 없음). year가 없으면 최신 규칙"""
+    rule = len(LEAVE_RULES) - 1 if year is None else rule_index(year)
+    return leave_pay(gross, idx, rule, False, custom_leave_pay)
+
+
+def get_parental_leave_pay(gross, idx, custom_leave_pay=None, year=None):
+    """휴직 idx번째 달(0부터)의 급여 (스칼라). custom_leave_pay가 있으면 수동 입력값 우선"""
+    return float(parental_leave_pay(gross, idx, custom_leave_pay, year))
+
+
+def insert_parental_leave(net, gross, start_idx, leave_months, custom_leave_pay=None, year=None):
+    """월별 세후 소득 배열(net)의 휴직 기간을 휴직 급여로 대체. gross는 같은 길이의 세전 배열,
+    start_idx는 시뮬레이션 시작월 기준 휴직 시작 월 인덱스"""
+    if leave_months == 0 or start_idx < 0:
+        return net
+    end_idx = min(start_idx + leave_months, len(net))
+    if end_idx > start_idx:
+        net[start_idx:end_idx] = parental_leave_pay(
+            gross[start_idx:end_idx], np.arange(end_idx - start_idx), custom_leave_pay, year
+        )
+    return net
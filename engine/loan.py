@@ -0,0 +1,119 @@
+# 주택 구입 대출 상환 계산 (금액 단위: 만원, 상환액만 원 단위)
+from typing import NamedTuple
+
+import numpy as np
+
+
+ANNUITY = "annuity"                  # 원리금균등
+EQUAL_PRINCIPAL = "equal_principal"  # 원금균등
+BULLET = "bullet"                    # 만기일시
+REPAYMENT_TYPES = (ANNUITY, EQUAL_PRINCIPAL, BULLET)
+
+
+class Schedule(NamedTuple):
+    """월별 상환 스케줄 (각 배열은 대출 조합 shape × months)"""
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+    cum_interest: np.ndarray
+
+
+def monthly_payment(need_loan, loan_rate, loan_year):
+    """원리금균등 월 상환액(원, 10원 단위 절사)"""
+    r = loan_rate / 100 / 12
+    n = loan_year * 12
+    if r > 0 and need_loan > 0:
+        payment = need_loan * 10000 * r * (1 + r) ** n / ((1 + r) ** n - 1)
+        return int(payment // 10) * 10
+    return 0
+
+
+def amortization_schedule(principal, loan_rate, loan_year, months=None):
+    """원리금균등 상환 스케줄을 닫힌 식으로 계산.
+    principal/loan_rate(연 %)/loan_year는 서로 broadcast 가능한 배열이고, months(기본: 최장 만기) 이후나
+    만기 이후 달은 0으로 채움"""
+    P, rate, years = np.broadcast_arrays(
+        np.asarray(principal, dtype=float), np.asarray(loan_rate, dtype=float), np.asarray(loan_year, dtype=float)
+    )
+    P = P[..., None]
+    r = rate[..., None] / 100 / 12
+    n = years[..., None] * 12
+    if months is None:
+        months = int(n.max()) if n.size else 0
+    k = np.arange(1, months + 1)
+    growth_n = (1 + r) ** n
+    growth_k = (1 + r) ** k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # k회 상환 후 잔액, 금리 0이면 원금 균등 감소
+        balance = np.where(r > 0, P * (growth_n - growth_k) / (growth_n - 1), P * (1 - k / n))
+    active = k <= n
+    balance = np.where(active, np.clip(balance, 0, None), 0.0)
+    prev_balance = np.concatenate([np.broadcast_to(P, balance.shape[:-1] + (1,)), balance[..., :-1]], axis=-1)
+    interest = np.where(active, prev_balance * r, 0.0)
+    principal_paid = prev_balance - balance
+    return Schedule(
+        payment=interest + principal_paid,
+        interest=interest,
+        principal=principal_paid,
+        balance=balance,
+        cum_interest=np.cumsum(interest, axis=-1),
+    )
+
+
+def rate_path(months, rate, changes=()):
+    """월별 연 금리(%) 경로: rate에서 시작해 changes [(적용 시작 월 인덱스, 금리)]부터 바뀜.
+    혼합형은 [(고정 기간, 변동 금리)], 계단형은 단계마다 한 항목"""
+    starts = np.array([0] + [int(m) for m, _ in changes])
+    rates = np.array([rate] + [r for _, r in changes], dtype=float)
+    order = np.argsort(starts, kind="stable")
+    return rates[order][np.searchsorted(starts[order], np.arange(months), side="right") - 1]
+
+
+def loan_schedule(principal, rates, term_months, repayment=ANNUITY, grace_months=0, months=None):
+    """상환 방식·금리 경로별 월 상환 스케줄.
+    rates는 월별 연 금리(%) 경로 (..., 월) 또는 스칼라 (짧으면 마지막 금리 유지), term_months는 거치 기간을
+    포함한 만기 개월 수, grace_months 동안은 이자만 낸다. 잔액은 달마다의 잔액 유지 비율 f의 누적곱:
+    원리금균등은 그 달 금리로 남은 기간 m에 다시 나눈 f = 1 - r/((1+r)^m - 1) (변동금리면 상환액 재산정),
+    원금균등은 f = 1 - 1/m, 거치 기간과 만기일시는 f = 1 (만기 달은 모두 0)"""
+    P = np.asarray(principal, dtype=float)[..., None]
+    term = np.asarray(term_months)[..., None]
+    grace = np.minimum(np.asarray(grace_months)[..., None], term - 1)
+    if months is None:
+        months = int(term.max()) if term.size else 0
+    r = np.asarray(rates, dtype=float) / 100 / 12
+    if r.ndim == 0:
+        r = np.full(months, r)
+    elif r.shape[-1] < months:
+        r = np.concatenate([r, np.repeat(r[..., -1:], months - r.shape[-1], axis=-1)], axis=-1)
+    r = r[..., :months]
+    k = np.arange(1, months + 1)
+    m = term - k + 1  # 이번 달을 포함한 남은 개월 수
+    active = m >= 1
+    m = np.maximum(m, 1)
+    if repayment == ANNUITY:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            keep = np.where(r > 0, 1 - r / ((1 + r) ** m - 1), 1 - 1 / m)
+    elif repayment == EQUAL_PRINCIPAL:
+        keep = 1 - 1 / m
+    elif repayment == BULLET:
+        keep = np.where(m == 1, 0.0, 1.0)
+    else:
+        raise ValueError(f"Unknown repayment type: {repayment}")
+    keep = np.where(k <= grace, 1.0, np.where(active & (m > 1), keep, 0.0))
+    balance = P * np.cumprod(keep, axis=-1)
+    prev_balance = np.concatenate([np.broadcast_to(P, balance.shape[:-1] + (1,)), balance[..., :-1]], axis=-1)
+    interest = np.where(active, prev_balance * r, 0.0)
+    principal_paid = prev_balance - balance
+    return Schedule(
+        payment=interest + principal_paid,
+        interest=interest,
+        principal=principal_paid,
+        balance=balance,
+        cum_interest=np.cumsum(interest, axis=-1),
+    )
+
+
+def house_value_path(house_price, annual_rate, years):
+    """연차별 집값 (연 annual_rate% 변동)"""
+    return house_price * (1 + annual_rate/100) ** np.asarray(years)
@@ -0,0 +1,91 @@
+# 임금상승률·물가·집값 상관 경로 몬테카를로 시뮬레이션 (연 단위, 금액 단위 만원)
+from typing import NamedTuple
+
+import numpy as np
+
+# 한 번에 계산하는 경로 수 (경로 묶음마다 SeedSequence 자식 시드를 하나씩 사용)
+CHUNK_PATHS = 10_000
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class MarketModel(NamedTuple):
+    """연간 충격 분포. sigma/mu는 %p, corr는 (임금, 물가, 집값) 상관행렬"""
+    wage_sigma: float = 1.5
+    cpi_sigma: float = 1.0
+    house_mu: float = 2.0
+    house_sigma: float = 6.0
+    corr: tuple = ((1.0, 0.5, 0.3), (0.5, 1.0, 0.4), (0.3, 0.4, 1.0))
+
+
+class ProjectionInputs(NamedTuple):
+    """결정론적 예측 결과(연 단위). 몬테카를로는 여기에 경로별 배수를 곱해 계산"""
+    income_yearly: np.ndarray       # 소득자 × 연도 세후 소득
+    raise_rates: np.ndarray         # 소득자별 기준 연봉 인상률(%)
+    indexed_expense: np.ndarray     # 연도별 물가 연동 지출(고정비/변동비/육아비 등)
+    nominal_expense: np.ndarray     # 연도별 명목 고정 지출(대출 상환 등)
+    inflation: float                # 기준 물가상승률(%)
+    house_price: float = 0.0        # 구입 주택 가격 (전세면 0)
+    loan_balance: np.ndarray = None  # 연도말 대출 잔액 (None이면 대출 없음)
+
+
+def correlated_shocks(model, n_paths, n_years, rng):
+    """(경로 × 연도 × 3) 상관 정규 충격 (%p): 임금, 물가, 집값 순"""
+    try:
+        chol = np.linalg.cholesky(np.asarray(model.corr, dtype=float))
+    except np.linalg.LinAlgError:
+        raise ValueError("상관행렬이 양의 정부호가 아닙니다") from None
+    sigma = np.array([model.wage_sigma, model.cpi_sigma, model.house_sigma])
+    z = rng.standard_normal((n_paths, n_years, 3))
+    return (z @ chol.T) * sigma
+
+
+def _path_ratio(rate, shock):
+    """기준 인상률 대비 경로별 누적 배수. 첫 해는 인상 전이므로 1"""
+    step = 1 + shock[:, 1:] / (100 + rate)
+    ratio = np.ones_like(shock)
+    np.cumprod(step, axis=1, out=ratio[:, 1:])
+    return ratio
+
+
+def simulate_paths(inputs, model, n_paths, rng, out_cash=None, out_assets=None):
+    """n_paths개 경로의 연도말 누적 순현금흐름과 순자산 (경로 × 연도, float32)"""
+    n_years = inputs.indexed_expense.shape[-1]
+    shocks = correlated_shocks(model, n_paths, n_years, rng)
+    income = np.zeros((n_paths, n_years))
+    for e, rate in enumerate(np.atleast_1d(inputs.raise_rates)):
+        income += inputs.income_yearly[e] * _path_ratio(rate, shocks[..., 0])
+    expense = inputs.indexed_expense * _path_ratio(inputs.inflation, shocks[..., 1]) + inputs.nominal_expense
+    if out_cash is None:
+        out_cash = np.empty((n_paths, n_years), dtype=np.float32)
+    if out_assets is None:
+        out_assets = np.empty((n_paths, n_years), dtype=np.float32)
+    cash = np.cumsum(income - expense, axis=1)
+    out_cash[:] = cash
+    if inputs.house_price:
+        house = inputs.house_price * np.cumprod(1 + (model.house_mu + shocks[..., 2]) / 100, axis=1)
+        loan = 0.0 if inputs.loan_balance is None else inputs.loan_balance
+        out_assets[:] = cash + house - loan
+    else:
+        out_assets[:] = cash
+    return out_cash, out_assets
+
+
+def shard_bounds(n_paths, chunk=CHUNK_PATHS):
+    """경로 묶음 (시작, 끝) 목록"""
+    return [(lo, min(lo + chunk, n_paths)) for lo in range(0, n_paths, chunk)]
+
+
+def run_monte_carlo(inputs, model, n_paths, seed=0, chunk=CHUNK_PATHS):
+    """묶음별로 시드를 나눠 전체 경로 계산. 같은 seed/chunk면 실행 방식과 무관하게 같은 결과"""
+    n_years = inputs.indexed_expense.shape[-1]
+    cash = np.empty((n_paths, n_years), dtype=np.float32)
+    assets = np.empty((n_paths, n_years), dtype=np.float32)
+    bounds = shard_bounds(n_paths, chunk)
+    for (lo, hi), ss in zip(bounds, np.random.SeedSequence(seed).spawn(len(bounds))):
+        simulate_paths(inputs, model, hi - lo, np.random.default_rng(ss), cash[lo:hi], assets[lo:hi])
+    return cash, assets
+
+
+def fan(values, percentiles=FAN_PERCENTILES):
+    """경로 축 백분위수 (백분위 × 연도)"""
+    return np.percentile(values, percentiles, axis=0)
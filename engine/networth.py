@@ -0,0 +1,108 @@
+# 순자산 경로: 월 흑자를 저축·투자 계좌에 나눠 복리로 쌓고, 집값과 대출 잔액을 더해 월별 순자산을 계산
+#
+# 계좌 잔액 B_t = B_{t-1}(1 + g_t) + c_t 는 누적 수익 배율 G_t = Π(1 + g_j)로 B_t = G_t × Σ c_k / G_k 가 되므로
+# 계좌 × 월 배열에 cumprod / cumsum 한 번씩으로 전체 기간을 구한다 (월 단위 파이썬 반복 없음).
+from typing import NamedTuple
+
+import numpy as np
+
+TAX_INTEREST = "interest"      # 이자가 붙을 때마다 과세 (예금: 이자소득세) → 세후 수익률로 복리
+TAX_GAINS = "gains"            # 평가 이익에 과세 (펀드: 매도 시 배당소득세) → 이익(잔액 - 납입액)만큼 차감
+TAX_WITHDRAWAL = "withdrawal"  # 인출액 전체에 과세 (연금저축: 연금소득세) → 잔액 전체에서 차감
+
+
+class Account(NamedTuple):
+    """적립 계좌 하나의 조건 (금액 만원)"""
+    name: str
+    share: float                # 월 흑자 중 이 계좌에 넣는 비율 (0~1)
+    annual_return: float        # 연 수익률 (%), 월별 경로 배열도 가능
+    tax: str = TAX_INTEREST
+    tax_rate: float = 0.154
+    credit_rate: float = 0.0    # 납입액 세액공제율 (다음 해 2월 환급액을 같은 계좌에 재투자)
+    credit_limit: float = 0.0   # 연간 세액공제 대상 납입 한도
+
+
+DEFAULT_ACCOUNTS = (
+    Account("Deposit", 0.4, 3.0, TAX_INTEREST, 0.154),
+    Account("Index Fund", 0.4, 6.0, TAX_GAINS, 0.154),
+    Account("Pension", 0.2, 5.0, TAX_WITHDRAWAL, 0.055, credit_rate=0.132, credit_limit=600),
+)
+
+
+class NetWorth(NamedTuple):
+    """월별 순자산 구성 (accounts/contributions는 계좌 × ... × 월, 나머지는 ... × 월)"""
+    accounts: np.ndarray        # 계좌별 세후 평가액
+    contributions: np.ndarray   # 계좌별 누적 납입액 (환급 재투자 포함)
+    cash: np.ndarray            # 계좌에 넣지 않은 누적 현금 (적자는 여기서 충당, 음수면 부족분)
+    house: np.ndarray           # 집값
+    loan: np.ndarray            # 대출 잔액
+    total: np.ndarray           # 순자산 = 현금 + 계좌 + 집값 - 대출
+
+
+def _monthly_rate(annual_return):
+    return (1 + np.asarray(annual_return, dtype=float) / 100) ** (1 / 12) - 1
+
+
+def _tax_credit(contrib, account):
+    """연간 한도 안의 납입액 × 공제율을 다음 해 2월에 환급하는 월별 배열 (월 수는 12의 배수)"""
+    months = contrib.shape[-1]
+    by_year = np.cumsum(contrib.reshape(*contrib.shape[:-1], months // 12, 12), axis=-1)
+    credit = np.minimum(by_year[..., -1], account.credit_limit) * account.credit_rate
+    refund = np.zeros_like(contrib)
+    slots = refund[..., 13::12]
+    slots[...] = credit[..., :slots.shape[-1]]
+    return refund
+
+
+def accumulate(net, accounts=DEFAULT_ACCOUNTS):
+    """월 순현금흐름 (..., 월) → (계좌별 세후 평가액, 계좌별 누적 납입액, 누적 현금).
+    흑자는 계좌 비율대로 나눠 넣고 남은 비율과 적자는 현금(수익 없음)에서 처리"""
+    net = np.asarray(net, dtype=float)
+    shares = np.array([a.share for a in accounts], dtype=float)
+    if (shares < 0).any() or shares.sum() > 1 + 1e-9:
+        raise ValueError("Account shares must be between 0 and 100% and sum to at most 100%")
+    surplus = np.maximum(net, 0.0)
+    values, bases = [], []
+    for account, share in zip(accounts, shares):
+        contrib = share * surplus
+        if account.credit_rate and account.credit_limit:
+            contrib = contrib + _tax_credit(contrib, account)
+        g = np.broadcast_to(_monthly_rate(account.annual_return), net.shape)
+        if account.tax == TAX_INTEREST:
+            g = g * (1 - account.tax_rate)
+        growth = np.cumprod(1 + g, axis=-1)
+        balance = growth * np.cumsum(contrib / growth, axis=-1)
+        basis = np.cumsum(contrib, axis=-1)
+        if account.tax == TAX_GAINS:
+            balance = balance - account.tax_rate * np.maximum(balance - basis, 0.0)
+        elif account.tax == TAX_WITHDRAWAL:
+            balance = balance * (1 - account.tax_rate)
+        values.append(balance)
+        bases.append(basis)
+    cash = np.cumsum(net - shares.sum() * surplus, axis=-1)
+    shape = (0,) + net.shape
+    return (np.stack(values) if values else np.zeros(shape)), (np.stack(bases) if bases else np.zeros(shape)), cash
+
+
+def net_worth(net, accounts=DEFAULT_ACCOUNTS, house_price=0.0, house_growth=0.0, loan_balance=None, start_cash=0.0):
+    """월 순현금흐름 → 월별 순자산 구성 (NetWorth). 집은 시작 시점에 house_price로 사서 연 house_growth%로
+    변동하고, loan_balance(월별 잔액, 짧으면 이후 0)를 뺀다"""
+    net = np.asarray(net, dtype=float)
+    months = net.shape[-1]
+    values, bases, cash = accumulate(net, accounts)
+    cash = cash + start_cash
+    growth = (1 + np.asarray(house_growth, dtype=float)[..., None] / 100) ** (np.arange(1, months + 1) / 12)
+    house = np.asarray(house_price, dtype=float)[..., None] * growth
+    loan = np.zeros(months)
+    if loan_balance is not None:
+        balance = np.asarray(loan_balance, dtype=float)[..., :months]
+        loan = np.zeros(balance.shape[:-1] + (months,))
+        loan[..., :balance.shape[-1]] = balance
+    return NetWorth(
+        accounts=values,
+        contributions=bases,
+        cash=cash,
+        house=house,
+        loan=loan,
+        total=cash + values.sum(axis=0) + house - loan,
+    )
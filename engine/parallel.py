@@ -0,0 +1,52 @@
+# 몬테카를로 경로를 프로세스 풀로 나눠 계산 (결과는 공유 메모리에 직접 기록)
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .montecarlo import CHUNK_PATHS, shard_bounds, simulate_paths
+
+
+def _run_shards(shm_names, shape, inputs, model, shards):
+    """워커: 공유 메모리 결과 배열에 붙어서 맡은 경로 묶음만 계산"""
+    blocks = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    try:
+        cash, assets = (np.ndarray(shape, dtype=np.float32, buffer=b.buf) for b in blocks)
+        for (lo, hi), ss in shards:
+            simulate_paths(inputs, model, hi - lo, np.random.default_rng(ss), cash[lo:hi], assets[lo:hi])
+        del cash, assets
+    finally:
+        for b in blocks:
+            b.close()
+    return len(shards)
+
+
+def run_monte_carlo_parallel(inputs, model, n_paths, seed=0, chunk=CHUNK_PATHS, max_workers=None):
+    """run_monte_carlo와 같은 결과를 여러 프로세스로 계산.
+    묶음별 시드는 SeedSequence(seed).spawn으로 고정되어 워커 수와 무관하게 결정적"""
+    n_years = inputs.indexed_expense.shape[-1]
+    shape = (n_paths, n_years)
+    bounds = shard_bounds(n_paths, chunk)
+    shards = list(zip(bounds, np.random.SeedSequence(seed).spawn(len(bounds))))
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(shards)))
+    nbytes = max(1, n_paths * n_years * np.dtype(np.float32).itemsize)
+    blocks = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(2)]
+    try:
+        # Streamlit 서버는 여러 세션 스레드가 도는 프로세스라 fork하면 다른 스레드가 잡고 있던 락
+        # (공유 캐시·로깅·BLAS)이 자식에서 풀리지 않을 수 있으므로 forkserver로 깨끗한 프로세스를 띄움
+        context = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_run_shards, [b.name for b in blocks], shape, inputs, model, shards[i::workers])
+                for i in range(workers)
+            ]
+            for f in futures:
+                f.result()
+        cash, assets = (np.ndarray(shape, dtype=np.float32, buffer=b.buf).copy() for b in blocks)
+    finally:
+        for b in blocks:
+            b.close()
+            b.unlink()
+    return cash, assets
@@ -0,0 +1,145 @@
+# 근로소득 원천징수 근사: 4대 보험 + 근로소득세(누진) + 지방소득세 (단위 만원, 월 세전 → 월 세후)
+#
+# 월 세전을 연간으로 환산해 연말정산 방식(근로소득공제 → 인적·보험료 공제 → 누진세율 → 근로소득세액공제)으로
+# 연 세액을 구한 뒤 12로 나눈다. 구간 계산은 모두 (경계, 구간 시작값, 세율) 표에 searchsorted를 적용하므로
+# 소득자 × 월 배열 전체를 한 번에 계산한다.
+from typing import NamedTuple
+
+import numpy as np
+
+
+class PayrollRules(NamedTuple):
+    """연도별 요율·구간표 (금액 만원, 연간 기준). 구간표는 (경계, 경계에서의 값, 구간 기울기)"""
+    pension_rate: float            # 국민연금 근로자 부담률
+    pension_base: tuple            # 국민연금 기준소득월액 (하한, 상한)
+    health_rate: float             # 건강보험
+    care_rate: float               # 장기요양보험 (건강보험료 대비)
+    employment_rate: float         # 고용보험
+    personal_deduction: float      # 인적공제 (1인당)
+    earned_deduction: tuple        # 근로소득공제
+    earned_deduction_cap: float
+    tax_brackets: tuple            # 종합소득세율
+    tax_credit: tuple              # 근로소득세액공제 (산출세액 기준)
+    tax_credit_limit: tuple        # 근로소득세액공제 한도 (총급여 기준)
+    local_tax_rate: float          # 지방소득세 (소득세 대비)
+
+
+def _table(thresholds, rates, first_value=0.0):
+    """경계·기울기 목록 → 경계마다의 누적 값을 채운 (경계, 값, 기울기) 배열 묶음"""
+    t = np.asarray(thresholds, dtype=float)
+    r = np.asarray(rates, dtype=float)
+    values = np.concatenate([[first_value], first_value + np.cumsum(np.diff(t) * r[:-1])])
+    return t, values, r
+
+
+RULES_2024 = PayrollRules(
+    pension_rate=0.045,
+    pension_base=(39.0, 617.0),
+    health_rate=0.03545,
+    care_rate=0.1295,
+    employment_rate=0.009,
+    personal_deduction=150.0,
+    earned_deduction=_table([0, 500, 1500, 4500, 10000], [0.70, 0.40, 0.15, 0.05, 0.02]),
+    earned_deduction_cap=2000.0,
+    tax_brackets=_table([0, 1400, 5000, 8800, 15000, 30000, 50000, 100000],
+                        [0.06, 0.15, 0.24, 0.35, 0.38, 0.40, 0.42, 0.45]),
+    tax_credit=_table([0, 130], [0.55, 0.30]),
+    # 한도는 총급여에 따라 줄어들되 구간별 최저 한도가 있음: (경계, 경계에서의 한도, 기울기, 최저)
+    tax_credit_limit=(np.array([0.0, 3300, 7000, 12000]), np.array([74.0, 74, 66, 50]),
+                      np.array([0.0, -0.008, -0.5, -0.5]), np.array([74.0, 66, 50, 20])),
+    local_tax_rate=0.10,
+)
+
+
+def _piecewise(x, table):
+    """구간표 값: 경계 t_i 이상인 마지막 구간 i에서 v_i + r_i × (x - t_i)"""
+    t, v, r = table[:3]
+    i = np.searchsorted(t, x, side="right") - 1
+    return v[i] + r[i] * (x - t[i])
+
+
+def deductions(gross, rules=RULES_2024, dependents=1):
+    """월 세전 배열 → 항목별 월 공제액 dict (pension/health/care/employment/income_tax/local_tax)"""
+    gross = np.maximum(np.asarray(gross, dtype=float), 0.0)
+    pension = np.where(gross > 0, rules.pension_rate * np.clip(gross, *rules.pension_base), 0.0)
+    health = rules.health_rate * gross
+    care = rules.care_rate * health
+    employment = rules.employment_rate * gross
+
+    annual = gross * 12
+    earned = np.maximum(annual - np.minimum(_piecewise(annual, rules.earned_deduction), rules.earned_deduction_cap), 0)
+    taxable = np.maximum(
+        earned - rules.personal_deduction * dependents - 12 * (pension + health + care + employment), 0
+    )
+    tax = _piecewise(taxable, rules.tax_brackets)
+    t, v, r, floor = rules.tax_credit_limit
+    i = np.searchsorted(t, annual, side="right") - 1
+    limit = np.maximum(v[i] + r[i] * (annual - t[i]), floor[i])
+    income_tax = np.maximum(tax - np.minimum(_piecewise(tax, rules.tax_credit), limit), 0) / 12
+    return {
+        "pension": pension,
+        "health": health,
+        "care": care,
+        "employment": employment,
+        "income_tax": income_tax,
+        "local_tax": income_tax * rules.local_tax_rate,
+    }
+
+
+def _direct_net(gross, rules, dependents):
+    return gross - sum(deductions(gross, rules, dependents).values())
+
+
+_TABLES = {}
+
+
+def net_table(rules=RULES_2024, dependents=1, top=10000.0, step=0.5):
+    """세전 → 세후 꺾은선 표 (꺾이는 점 x, 세후 y). 세후는 세전의 구간 선형 함수이므로
+    격자에서 기울기가 바뀌는 곳을 찾아 양옆 직선의 교점으로 꺾이는 점을 정확히 구한다"""
+    key = (id(rules), dependents, top, step)
+    if key not in _TABLES:
+        x = np.arange(step, top + 2 * step, step)
+        y = _direct_net(x, rules, dependents)
+        slope = np.diff(y) / step
+        # 양옆 칸과 기울기가 같은 칸은 한 직선 위에 있음 → 그런 칸들의 연속 구간(run)마다 직선 하나
+        same = np.isclose(slope[1:], slope[:-1], rtol=0, atol=1e-9)
+        clean = np.zeros(len(slope), dtype=bool)
+        clean[1:] |= same
+        clean[:-1] |= same
+        runs = []  # (칸 번호, 기울기)
+        for i in np.flatnonzero(clean):
+            if not runs or not (runs[-1][0] == i - 1 and np.isclose(runs[-1][1], slope[i], rtol=0, atol=1e-9)):
+                runs.append((i, slope[i]))
+            else:
+                runs[-1] = (i, slope[i])  # run의 마지막 칸으로 갱신 (직선은 같음)
+        knots = [x[0]]
+        for (i, s0), (j, s1) in zip(runs, runs[1:]):
+            # 이웃한 두 직선의 교점 (두 run 사이에 꺾이는 점이 하나뿐이라는 가정)
+            knots.append((y[j] - y[i] + s0 * x[i] - s1 * x[j]) / (s0 - s1))
+        knots.append(top)
+        xs = np.unique(np.asarray(knots))
+        _TABLES[key] = (rules, xs, _direct_net(xs, rules, dependents))
+    return _TABLES[key][1:]
+
+
+def net_pay(gross, rules=RULES_2024, dependents=1):
+    """월 세전 → 월 세후 (절사 전 값, 0 이상). 미리 만든 꺾은선 표를 보간하므로 원소당 비용은 탐색 한 번"""
+    xs, ys = net_table(rules, dependents)
+    gross = np.asarray(gross, dtype=float)
+    net = np.interp(gross, xs, ys)
+    # 표 범위를 넘는 고소득은 마지막 구간 기울기로 연장
+    over = gross > xs[-1]
+    if over.any():
+        net = np.where(over, ys[-1] + (gross - xs[-1]) * (ys[-1] - ys[-2]) / (xs[-1] - xs[-2]), net)
+    return np.where(gross > 0, np.maximum(net, 0.0), 0.0)
+
+
+def net_to_gross(net, rules=RULES_2024, dependents=1):
+    """월 세후 → 월 세전. 세후는 세전에 대해 강한 증가 함수이므로 같은 표를 거꾸로 보간"""
+    xs, ys = net_table(rules, dependents)
+    net = np.asarray(net, dtype=float)
+    gross = np.interp(net, ys, xs)
+    over = net > ys[-1]
+    if over.any():
+        gross = np.where(over, xs[-1] + (net - ys[-1]) * (xs[-1] - xs[-2]) / (ys[-1] - ys[-2]), gross)
+    return np.where(net > 0, gross, 0.0)
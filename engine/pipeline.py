@@ -0,0 +1,122 @@
+# 앱 계산 그래프 구성: 소득 → 휴직 / 대출 / 지출 / 육아비 → 가계부 → 자금흐름
+import numpy as np
+
+from .childcare import childcare_costs
+from .compact import compact
+from .graph import Graph
+from .income import gross_to_net, project_gross
+from .leave import apply_leaves
+from .networth import DEFAULT_ACCOUNTS, Account, net_worth
+from .loan import ANNUITY, rate_path
+from .stages import expense_stage, loan_product_stage
+from .timeline import timeline
+
+START_YEAR = 2024
+
+
+def timeline_node(last_years):
+    """시뮬레이션 시간축 (시작 연도 ~ 부부 중 늦은 은퇴 연도)"""
+    return timeline(START_YEAR, max(int(max(last_years)), START_YEAR))
+
+
+def income_node(income_inputs, tl):
+    """세전 월 소득 (소득자 × 월)"""
+    return project_gross(income_inputs["base_gross"], income_inputs["rates"], tl.n_years)
+
+
+def leave_windows(leaves):
+    """휴직 목록 → (소득자 번호, 시작 연도, 시작 월, 개월 수) 배열 (소득자 × 4 열).
+    예전 형식 [(시작 연도, 시작 월, 개월 수) 소득자 순서]도 받는다"""
+    rows = [leave if len(leave) == 4 else (e, *leave) for e, leave in enumerate(leaves)]
+    return np.asarray(rows, dtype=int).reshape(-1, 4)
+
+
+def leave_node(gross, leave_inputs, tl):
+    """휴직 기간을 휴직 급여로 대체한 세후 소득 (소득자 × 월)"""
+    earner, start_year, start_month, length = leave_windows(leave_inputs["leaves"]).T
+    return apply_leaves(
+        gross_to_net(gross), gross, earner, (start_year - tl.start_year) * 12 + start_month - 1, length, start_year,
+        leave_inputs.get("custom_leave_pay"), leave_inputs.get("parents_bonus", True),
+    )
+
+
+def loan_node(loan_inputs, tl):
+    """구입 시 월별 상환 스케줄 (상환 방식·거치 기간·금리 변경 반영), 전세/미선택이면 None"""
+    if loan_inputs is None:
+        return None
+    months = max(loan_inputs["loan_year"] * 12, tl.n_months)
+    return loan_product_stage(
+        loan_inputs["need_loan"],
+        rate_path(months, loan_inputs["loan_rate"], loan_inputs.get("rate_changes", ())),
+        loan_inputs["loan_year"] * 12,
+        loan_inputs.get("repayment", ANNUITY),
+        loan_inputs.get("grace_months", 0),
+        months=months,
+    )
+
+
+def expenses_node(budget_inputs, housing_payment, inflation, loan, tl):
+    """고정비/변동비/주거비 월별 배열 (육아비 제외)"""
+    return expense_stage(
+        budget_inputs["fixed"], budget_inputs["var"], housing_payment or 0, [], tl.n_months, inflation,
+        base_year=tl.start_year, housing_schedule=None if loan is None else loan.payment,
+    )
+
+
+def childcare_node(children, inflation, tl):
+    if not children:
+        return np.zeros(tl.n_months)
+    birth = np.asarray(children)
+    return childcare_costs(birth[:, 0], birth[:, 1], tl.n_months, inflation, tl.start_year).sum(axis=0)
+
+
+def budget_node(expenses, childcare):
+    """항목별 월 지출과 합계"""
+    budget = {k: expenses[k] for k in ("fixed", "var", "housing")}
+    budget["childcare"] = childcare
+    budget["total"] = expenses["total"] + childcare
+    return budget
+
+
+def cashflow_node(net, budget):
+    """월별 소득 / 지출 / 순현금흐름"""
+    income = net.sum(axis=0)
+    return {"income": income, "expense": budget["total"], "net": income - budget["total"]}
+
+
+def networth_node(cashflow, loan, loan_inputs, accounts, tl):
+    """월 흑자를 계좌에 쌓은 평가액 + 현금 + 집값 - 대출 잔액 (구입 시 집값은 up_rate로 변동)"""
+    house = loan_inputs or {}
+    return net_worth(
+        cashflow["net"], [Account(*a) for a in accounts], house.get("price", 0.0), house.get("up_rate", 0.0),
+        None if loan is None else loan.balance[:tl.n_months],
+    )
+
+
+def build_household_graph():
+    """페이지들이 공유하는 계산 그래프. 입력은 각 페이지가 설정하고 값은 필요한 페이지가 꺼내 씀"""
+    g = Graph(store=compact)
+    # 1페이지 입력
+    g.add_input("last_years")
+    g.add_input("income_inputs")
+    g.add_input("leave_inputs")
+    # 2페이지 입력 (선택 전에는 대출 없음 / 주거비 미정)
+    g.add_input("loan_inputs", None)
+    g.add_input("housing_payment", None)
+    # 3페이지 입력
+    g.add_input("inflation")
+    g.add_input("children")
+    g.add_input("budget_inputs")
+    # 4페이지 입력
+    g.add_input("accounts", DEFAULT_ACCOUNTS)
+
+    g.add_node("timeline", timeline_node, ["last_years"])
+    g.add_node("income", income_node, ["income_inputs", "timeline"])
+    g.add_node("leave", leave_node, ["income", "leave_inputs", "timeline"])
+    g.add_node("loan", loan_node, ["loan_inputs", "timeline"])
+    g.add_node("expenses", expenses_node, ["budget_inputs", "housing_payment", "inflation", "loan", "timeline"])
+    g.add_node("childcare", childcare_node, ["children", "inflation", "timeline"])
+    g.add_node("budget", budget_node, ["expenses", "childcare"])
+    g.add_node("cashflow", cashflow_node, ["leave", "budget"])
+    g.add_node("networth", networth_node, ["cashflow", "loan", "loan_inputs", "accounts", "timeline"])
+    return g
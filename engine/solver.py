@@ -0,0 +1,122 @@
+# 목표 역산: 제약(누적 잔액 하한, DSR 상한)을 만족하는 최대 집값·최소 현금·최종 구입 시점
+#
+# 후보 여러 개를 한 번에 평가하는 k분할 탐색을 사용한다. 제약 충족 여부가 변수에 대해 단조이므로
+# 매 반복마다 구간을 (points - 1)분의 1로 줄인다.
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Household(NamedTuple):
+    """월별 가계 흐름 (주거비 제외, 단위 만원)"""
+    income: np.ndarray        # 세후 소득
+    gross_income: np.ndarray  # 세전 소득 (DSR 계산용)
+    expense: np.ndarray       # 주거비를 뺀 지출
+
+
+def _annuity(principal, loan_rate, loan_year):
+    r = np.asarray(loan_rate, dtype=float) / 100 / 12
+    n = np.asarray(loan_year, dtype=float) * 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gn = (1 + r) ** n
+        return np.where(r > 0, principal * r * gn / np.where(r > 0, gn - 1, 1), principal / n)
+
+
+def _remaining(principal, loan_rate, loan_year, paid):
+    """원리금균등 대출을 paid회 상환한 뒤 남은 잔액"""
+    r = np.asarray(loan_rate, dtype=float) / 100 / 12
+    n = np.asarray(loan_year, dtype=float) * 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gn = (1 + r) ** n
+        left = np.where(r > 0, principal * (gn - (1 + r) ** paid) / np.where(r > 0, gn - 1, 1), principal * (1 - paid / n))
+    return np.clip(left, 0, None)
+
+
+def evaluate(household, prices, cash, loan_rate, loan_year, start_month=0):
+    """후보별 (최저 누적 잔액, DSR). prices/cash/start_month는 서로 broadcast 가능한 배열.
+    누적 잔액은 통합 페이지의 누적 순현금흐름에 대출 상환액을 반영한 값이고, 기간 끝에 남은 대출 잔액은
+    마지막 달에 갚는 것으로 본다 (늦게 사서 기간 밖으로 밀린 상환도 비용에 포함)"""
+    prices, cash, start = np.broadcast_arrays(
+        np.asarray(prices, dtype=float), np.asarray(cash, dtype=float), np.asarray(start_month)
+    )
+    principal = np.maximum(prices - cash, 0)
+    payment = _annuity(principal, loan_rate, loan_year)
+    n = int(round(loan_year * 12))
+    t = np.arange(len(household.income))
+    # t월까지 낸 상환 횟수 (구입 월부터 만기까지)
+    paid = np.clip(t - start[..., None] + 1, 0, n)
+    cum = np.cumsum(household.income - household.expense) - payment[..., None] * paid
+    cum[..., -1] -= _remaining(principal, loan_rate, loan_year, paid[..., -1])
+    # DSR: 구입 후 첫 12개월 세전 소득 대비 연간 원리금
+    gross_cum = np.concatenate([[0.0], np.cumsum(household.gross_income)])
+    first_year = np.minimum(start + 12, len(t))
+    annual_gross = (gross_cum[first_year] - gross_cum[np.minimum(start, len(t))]) * 12 / np.maximum(first_year - start, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dsr = np.where(annual_gross > 0, payment * 12 / annual_gross, np.inf)
+    return cum.min(axis=-1), dsr
+
+
+def _feasible(household, prices, cash, loan_rate, loan_year, min_balance, max_dsr, start_month=0):
+    low, dsr = evaluate(household, prices, cash, loan_rate, loan_year, start_month)
+    ok = low >= min_balance
+    if max_dsr is not None:
+        ok &= (dsr <= max_dsr) | (np.asarray(prices) <= np.asarray(cash))
+    return ok
+
+
+def _ksection(feasible, lo, hi, increasing, points=64, tol=1.0, max_iter=60):
+    """feasible(배열)→bool 배열이 단조일 때 경계값. increasing이면 최소 충족값, 아니면 최대 충족값"""
+    for _ in range(max_iter):
+        if hi - lo <= tol:
+            break
+        xs = np.linspace(lo, hi, points)
+        ok = feasible(xs)
+        if increasing:
+            i = int(np.argmax(ok)) if ok.any() else points - 1
+            lo, hi = xs[max(i - 1, 0)], xs[i]
+        else:
+            i = int(np.argmin(ok)) if not ok.all() else points - 1
+            lo, hi = xs[max(i - 1, 0)], xs[i]
+    return hi if increasing else lo
+
+
+def max_house_price(household, cash, loan_rate, loan_year, min_balance=0.0, max_dsr=None, tol=1.0):
+    """제약을 만족하는 최대 집값. 대출 없이도(집값 = 현금) 안 되면 None"""
+    def feasible(p):
+        return _feasible(household, p, cash, loan_rate, loan_year, min_balance, max_dsr)
+
+    if not feasible(np.array([cash]))[0]:
+        return None
+    hi = max(cash, 1.0) * 2
+    while feasible(np.array([hi]))[0]:
+        hi *= 2
+        if hi > 1e9:
+            return np.inf
+    return float(_ksection(feasible, cash, hi, increasing=False, tol=tol))
+
+
+def min_cash(household, price, loan_rate, loan_year, min_balance=0.0, max_dsr=None, tol=1.0):
+    """price 집을 살 때 필요한 최소 현금. 전액 현금으로도 안 되면 None"""
+    def feasible(c):
+        return _feasible(household, price, c, loan_rate, loan_year, min_balance, max_dsr)
+
+    if feasible(np.array([0.0]))[0]:
+        return 0.0
+    if not feasible(np.array([float(price)]))[0]:
+        return None
+    return float(_ksection(feasible, 0.0, float(price), increasing=True, tol=tol))
+
+
+def purchase_year_feasibility(household, price, cash, loan_rate, loan_year, house_growth=0.0,
+                              min_balance=0.0, max_dsr=None):
+    """연차별(0부터) 구입 가능 여부. y년차 집값은 price × (1+house_growth)^y, 상환은 그 해 1월부터"""
+    years = np.arange(len(household.income) // 12)
+    prices = price * (1 + house_growth / 100) ** years
+    return _feasible(household, prices, cash, loan_rate, loan_year, min_balance, max_dsr, start_month=years * 12)
+
+
+def latest_purchase_year(household, price, cash, loan_rate, loan_year, house_growth=0.0,
+                         min_balance=0.0, max_dsr=None):
+    """구입 가능한 마지막 연차 (없으면 None)"""
+    ok = purchase_year_feasibility(household, price, cash, loan_rate, loan_year, house_growth, min_balance, max_dsr)
+    return int(np.flatnonzero(ok)[-1]) if ok.any() else None
@@ -0,0 +1,19 @@
+# 계산 단계 (입력 지문 캐시 적용, 세션 간 공유). 같은 입력의 재실행은 캐시에서 바로 반환
+from .budget import build_expenses
+from .cache import memoize
+from .loan import loan_schedule
+from .montecarlo import run_monte_carlo
+from .parallel import run_monte_carlo_parallel
+from .sweep import loan_grid
+
+
+expense_stage = memoize(maxsize=32)(build_expenses)
+loan_product_stage = memoize(maxsize=32)(loan_schedule)
+sweep_stage = memoize(maxsize=8)(loan_grid)
+
+
+@memoize(maxsize=4)
+def monte_carlo_stage(inputs, model, n_paths, seed=0, parallel=False):
+    """몬테카를로 결과 (경로가 많으면 결과가 크므로 캐시 개수를 작게)"""
+    run = run_monte_carlo_parallel if parallel else run_monte_carlo
+    return run(inputs, model, n_paths, seed=seed)
@@ -0,0 +1,172 @@
+# 시나리오 저장소 (SQLite): 입력은 JSON, 계산 결과는 npz 압축 배열 묶음(BLOB)으로 한 행에 저장
+#
+# 목록/검색은 BLOB을 읽지 않는 컬럼만 조회하고 updated 인덱스로 정렬하므로 저장 개수가 늘어도 빠르다.
+import io
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+import numpy as np
+
+from .loan import Schedule
+from .networth import NetWorth
+
+DEFAULT_PATH = "scenarios.db"
+
+# 결과 값에 들어 있을 수 있는 NamedTuple 종류 (이름 → 클래스)
+_TUPLES = {"Schedule": Schedule, "NetWorth": NetWorth}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    widgets TEXT NOT NULL,   -- 화면 입력값 (session_state) JSON
+    inputs TEXT NOT NULL,    -- 계산 그래프 입력 JSON
+    results BLOB             -- 계산 그래프 노드 값 (npz)
+);
+CREATE INDEX IF NOT EXISTS scenarios_updated ON scenarios (updated DESC);
+"""
+
+
+def _encode(obj):
+    """JSON으로 바꿀 수 있는 형태로 (tuple은 표식을 붙여 list와 구분, numpy 값은 파이썬 값으로)"""
+    if isinstance(obj, tuple):
+        return {"__tuple__": [_encode(v) for v in obj]}
+    if isinstance(obj, list):
+        return [_encode(v) for v in obj]
+    if isinstance(obj, dict):
+        return {str(k): _encode(v) for k, v in obj.items()}
+    if isinstance(obj, np.ndarray):
+        return _encode(obj.tolist())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def _decode(obj):
+    if isinstance(obj, dict):
+        if set(obj) == {"__tuple__"}:
+            return tuple(obj["__tuple__"])
+        return obj
+    return obj
+
+
+def dumps(obj):
+    return json.dumps(_encode(obj), ensure_ascii=False)
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+def pack(values):
+    """노드 값 dict → npz 바이트. 배열은 '노드/키' 이름으로 저장하고 구조는 __layout__에 기록"""
+    arrays, layout = {}, {}
+    for name, value in values.items():
+        if value is None:
+            layout[name] = {"kind": "none"}
+        elif isinstance(value, np.ndarray):
+            arrays[name] = value
+            layout[name] = {"kind": "array"}
+        elif isinstance(value, dict):
+            arrays.update({f"{name}/{k}": np.asarray(v) for k, v in value.items()})
+            layout[name] = {"kind": "dict", "keys": list(value)}
+        elif isinstance(value, tuple) and type(value).__name__ in _TUPLES:
+            arrays.update({f"{name}/{k}": np.asarray(v) for k, v in zip(value._fields, value)})
+            layout[name] = {"kind": "namedtuple", "type": type(value).__name__, "keys": list(value._fields)}
+        elif isinstance(value, tuple):
+            arrays.update({f"{name}/{i}": np.asarray(v) for i, v in enumerate(value)})
+            layout[name] = {"kind": "tuple", "keys": [str(i) for i in range(len(value))]}
+        # 그 밖의 값은 저장하지 않음 (불러올 때 다시 계산)
+    buf = io.BytesIO()
+    np.savez_compressed(buf, __layout__=np.frombuffer(json.dumps(layout).encode(), dtype=np.uint8), **arrays)
+    return buf.getvalue()
+
+
+def unpack(blob):
+    """pack 결과 → 노드 값 dict"""
+    with np.load(io.BytesIO(blob)) as npz:
+        layout = json.loads(npz["__layout__"].tobytes().decode())
+        values = {}
+        for name, spec in layout.items():
+            kind = spec["kind"]
+            if kind == "none":
+                values[name] = None
+            elif kind == "array":
+                values[name] = npz[name]
+            else:
+                items = [npz[f"{name}/{k}"] for k in spec["keys"]]
+                if kind == "dict":
+                    values[name] = dict(zip(spec["keys"], items))
+                elif kind == "namedtuple":
+                    values[name] = _TUPLES[spec["type"]](*items)
+                else:
+                    values[name] = tuple(items)
+    return values
+
+
+class ScenarioStore:
+    """이름 붙은 시나리오 저장/불러오기/목록/삭제"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def save(self, name, widgets, inputs, values):
+        """같은 이름이 있으면 덮어쓰기. 시나리오 id 반환"""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO scenarios (name, created, updated, widgets, inputs, results) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET updated = excluded.updated, widgets = excluded.widgets, "
+                "inputs = excluded.inputs, results = excluded.results",
+                (name, now, now, dumps(widgets), dumps(inputs), pack(values)),
+            )
+            return conn.execute("SELECT id FROM scenarios WHERE name = ?", (name,)).fetchone()[0]
+
+    def load(self, scenario_id):
+        """(이름, 화면 입력 dict, 그래프 입력 dict, 노드 값 dict). 없으면 KeyError"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT name, widgets, inputs, results FROM scenarios WHERE id = ?", (scenario_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(scenario_id)
+        name, widgets, inputs, results = row
+        return name, loads(widgets), loads(inputs), unpack(results) if results else {}
+
+    def load_inputs(self, scenario_ids):
+        """{id: (이름, 그래프 입력 dict)} (결과 BLOB은 읽지 않음)"""
+        ids = [int(i) for i in scenario_ids]
+        if not ids:
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT id, name, inputs FROM scenarios WHERE id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+        return {sid: (name, loads(inputs)) for sid, name, inputs in rows}
+
+    def list(self, search="", limit=50):
+        """최근 수정 순 [(id, 이름, 수정 시각)]. search가 있으면 이름에 포함된 것만"""
+        pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT id, name, updated FROM scenarios WHERE name LIKE ? ESCAPE '\\' "
+                "ORDER BY updated DESC LIMIT ?",
+                (pattern, limit),
+            ).fetchall()
+
+    def delete(self, scenario_id):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
@@ -0,0 +1,35 @@
+# 대출 조건(금리 × 기간 × 집값 × 현금) 전체 격자를 한 번의 broadcast 계산으로 평가
+from typing import NamedTuple
+
+import numpy as np
+
+
+class LoanGrid(NamedTuple):
+    """축 값과 결과 배열 (각 결과는 rates × terms × prices × cash shape, 단위 만원)"""
+    rates: np.ndarray
+    terms: np.ndarray
+    prices: np.ndarray
+    cash: np.ndarray
+    payment: np.ndarray         # 월 상환액
+    total_interest: np.ndarray  # 만기까지 총 이자
+    equity: np.ndarray          # horizon_years 후 순자산 (집값 - 대출 잔액)
+
+
+def loan_grid(rates, terms, prices, cash, horizon_years, house_growth=0.0):
+    """원리금균등 상환 조건 격자 평가. rates(연 %), terms(년), prices, cash는 1차원 축 값"""
+    rates, terms, prices, cash = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (rates, terms, prices, cash))
+    r = rates[:, None, None, None] / 100 / 12
+    n = terms[None, :, None, None] * 12
+    price = prices[None, None, :, None]
+    principal = np.maximum(price - cash[None, None, None, :], 0)
+    growth_n = (1 + r) ** n
+    k = np.minimum(horizon_years * 12, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = np.where(r > 0, principal * r * growth_n / (growth_n - 1), principal / n)
+        balance = np.where(r > 0, principal * (growth_n - (1 + r) ** k) / (growth_n - 1), principal * (1 - k / n))
+    return LoanGrid(
+        rates=rates, terms=terms, prices=prices, cash=cash,
+        payment=payment,
+        total_interest=payment * n - principal,
+        equity=price * (1 + house_growth / 100) ** horizon_years - balance,
+    )
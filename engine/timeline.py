@@ -0,0 +1,79 @@
+# 시뮬레이션 시간축: 연도/월 인덱스, 라벨, 연도별 집계를 한 객체로 (구간마다 하나를 모든 페이지·세션이 공유)
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from .compact import shared_years
+
+
+def _readonly(a):
+    a.setflags(write=False)
+    return a
+
+
+class Timeline:
+    """start_year 1월 ~ end_year 12월 월 단위 시간축. 라벨은 처음 쓸 때 만들고 이후 재사용"""
+
+    def __init__(self, start_year, end_year):
+        self.start_year = int(start_year)
+        self.end_year = int(end_year)
+        self.n_years = self.end_year - self.start_year + 1
+        self.n_months = self.n_years * 12
+
+    def __len__(self):
+        return self.n_months
+
+    def __repr__(self):
+        return f"Timeline({self.start_year}, {self.end_year})"
+
+    @property
+    def years(self):
+        """연도 배열 (읽기 전용 int64)"""
+        return shared_years(self.start_year, self.end_year)
+
+    @cached_property
+    def month_index(self):
+        """0부터 시작하는 월 인덱스"""
+        return _readonly(np.arange(self.n_months))
+
+    @cached_property
+    def month_year(self):
+        """월별 연도"""
+        return _readonly(self.start_year + self.month_index // 12)
+
+    @cached_property
+    def month_of_year(self):
+        """월별 1~12월"""
+        return _readonly(self.month_index % 12 + 1)
+
+    @cached_property
+    def year_labels(self):
+        return tuple(f"{y}" for y in self.years)
+
+    @cached_property
+    def month_labels(self):
+        return tuple(f"{y}Y {m}M" for y, m in zip(self.month_year.tolist(), self.month_of_year.tolist()))
+
+    def year_start(self, year):
+        """year 1월의 월 인덱스"""
+        return (int(year) - self.start_year) * 12
+
+    def year_slice(self, year, n_years=1):
+        """year부터 n_years년 구간의 월 slice"""
+        start = self.year_start(year)
+        return slice(start, start + n_years * 12)
+
+    def by_year(self, monthly):
+        """(..., 월) 배열 → (..., 연도, 12) 보기 (복사 없음)"""
+        monthly = np.asarray(monthly)
+        return monthly.reshape(*monthly.shape[:-1], self.n_years, 12)
+
+    def yearly(self, monthly):
+        """(..., 월) 배열의 연도별 합계 (..., 연도)"""
+        return self.by_year(monthly).sum(axis=-1)
+
+
+@lru_cache(maxsize=32)
+def timeline(start_year, end_year):
+    """구간별로 하나만 만드는 Timeline"""
+    return Timeline(start_year, end_year)
@@ -0,0 +1,62 @@
+# 재실행(rerun) 단위 구간 계측: 이름 붙은 span의 소요 시간을 모으고, 원하면 JSON-lines로 기록
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class SpanRecorder:
+    """span(name) 구간 시간을 재실행 단위로 모음. 한 재실행이 끝나면 last에 (이름, 초) 목록이 남는다"""
+
+    def __init__(self, session_id="", log_path=None):
+        self.session_id = session_id
+        self.log_path = log_path   # None이면 파일 기록 안 함
+        self.last = []             # 직전 재실행의 [(이름, 초)]
+        self.last_total = 0.0
+        self.last_label = ""
+        self.label = ""            # 이번 재실행 표시 이름 (예: 페이지)
+        self._spans = []
+        self._start = None
+        self._mark = None          # 마지막 span이 끝난 시각
+
+    def begin(self):
+        """새 재실행 시작. 이전 재실행이 end 없이 중단됐으면(st.stop 등) 여기서 마무리"""
+        if self._start is not None:
+            self.end(until=self._mark)
+        self._spans = []
+        self.label = ""
+        self._start = self._mark = time.perf_counter()
+
+    @contextmanager
+    def span(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._mark = time.perf_counter()
+            self._spans.append((name, self._mark - t0))
+
+    def end(self, until=None):
+        """재실행 종료: last 갱신, log_path가 있으면 한 줄 기록. until은 종료 시각(기본 지금)"""
+        if self._start is None:
+            return
+        self.last = self._spans
+        self.last_total = (until or time.perf_counter()) - self._start
+        self.last_label = self.label
+        self._start = None
+        if self.log_path:
+            record = {
+                "ts": time.time(), "session": self.session_id, "label": self.last_label,
+                "total": self.last_total, "spans": [{"name": n, "seconds": s} for n, s in self.last],
+            }
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def breakdown(self):
+        """직전 재실행의 이름별 (이름, 횟수, 합계 초), 합계 큰 순"""
+        total = defaultdict(float)
+        count = defaultdict(int)
+        for name, seconds in self.last:
+            total[name] += seconds
+            count[name] += 1
+        return sorted(((n, count[n], total[n]) for n in total), key=lambda row: -row[2])
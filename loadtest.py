@@ -0,0 +1,235 @@
+# 동시 세션 부하 테스트: Streamlit AppTest로 실제 페이지를 헤드리스로 돌려 서버 한 대의 수용량을 잰다
+#
+#   python loadtest.py [--app loan_rev7_eng.py] [--concurrency 1,4,8] [--sessions 2]
+#                      [--target-p95 1000] [--out loadtest.json] [--seed 0]
+#
+# 세션마다 4개 페이지를 오가며 급여·휴직·자녀·대출 입력을 바꾸는 시나리오를 실행하고, 동시 세션 수별로
+# rerun 지연 백분위수, 처리량(rerun/s), 세션당 메모리를 구한다. 동시 세션 수를 늘려 가며 p95가
+# --target-p95 이하인 가장 큰 동시 세션 수를 수용량(capacity)으로 기록한다.
+#
+# AppTest는 rerun마다 프로세스 전역 런타임(Runtime._instance, 설정값)을 바꿔 끼우므로 한 프로세스 안에서
+# 세션을 동시에 돌릴 수 없다. 그래서 동시 세션 하나를 작업 프로세스 하나로 띄우고 (CPU는 함께 나눠 씀),
+# 각 프로세스는 빈 세션 하나로 데운 뒤 자기 몫의 세션을 차례로 실행한다.
+import argparse
+import gc
+import multiprocessing
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+from engine import nbytes
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loan_rev7_eng.py")
+PAGES = ("월별 실수령액 시뮬레이션", "집 장만 시뮬레이션", "예상 가계부 시뮬레이션", "통합 자금흐름/잔액 분석")
+PERCENTILES = (50, 90, 95, 99)
+_BASE_RSS = 0  # 작업 프로세스의 데운 뒤 RSS (_warm_up에서 설정)
+
+
+def _page(page):
+    return lambda at, rng: at.sidebar.selectbox[0].set_value(page)
+
+
+def _number(key, low, high, step=1):
+    return lambda at, rng: at.number_input(key=key).set_value(int(rng.integers(low // step, high // step + 1)) * step)
+
+
+def _slider(key, low, high, step):
+    def act(at, rng):
+        value = low + step * int(rng.integers(0, round((high - low) / step) + 1))
+        at.slider(key=key).set_value(value if isinstance(step, int) else round(value, 2))
+    return act
+
+
+def _select(key, value):
+    return lambda at, rng: (at.radio if key == "view_mode" else at.selectbox)(key=key).set_value(value)
+
+
+# 한 세션의 시나리오: (단계 이름, 위젯 조작). 조작 뒤마다 rerun 한 번
+SESSION_STEPS = (
+    ("salary:husband", _number("husband_annual", 3000, 9000, 100)),
+    ("salary:wife", _number("wife_annual", 2000, 7000, 100)),
+    ("salary:raise", _slider("husband_rate", 1.0, 6.0, 0.5)),
+    ("leave:wife", _number("wy_months", 3, 12)),
+    ("leave:husband", _number("hy_months", 0, 6)),
+    ("page:house", _page(PAGES[1])),
+    ("loan:price", _number("house_price", 40000, 120000, 500)),
+    ("loan:term", _slider("loan_year", 10, 40, 1)),
+    ("loan:rate", _slider("loan_rate", 2.0, 6.0, 0.1)),
+    ("page:budget", _page(PAGES[2])),
+    ("children:count", _number("num_children", 0, 3)),
+    ("budget:inflation", _slider("inflation", 1.0, 4.0, 0.1)),
+    ("page:cashflow", _page(PAGES[3])),
+    ("cashflow:monthly", _select("view_mode", "Monthly")),
+    ("page:salary", _page(PAGES[0])),
+    ("salary:retire", _number("husband_retire_age", 55, 70)),
+    ("page:cashflow", _page(PAGES[3])),
+)
+
+
+def rss_bytes():
+    """현재 프로세스 RSS (리눅스 /proc, 그 외는 최대 RSS로 대신)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_session(app, seed, timeout):
+    """세션 하나 실행 → (AppTest, [(단계, 초)], 오류 목록)"""
+    rng = np.random.default_rng(seed)
+    at = AppTest.from_file(app, default_timeout=timeout)
+    timings, errors = [], []
+
+    def rerun(step):
+        start = time.perf_counter()
+        at.run()
+        timings.append((step, time.perf_counter() - start))
+        if at.exception:
+            errors.append(f"{step}: {at.exception[0].message}")
+
+    rerun("start")
+    for step, act in SESSION_STEPS:
+        if errors:
+            break
+        try:
+            act(at, rng)
+        except KeyError as e:  # 시나리오의 위젯이 화면에 없음 (앱 화면 구성이 바뀜)
+            errors.append(f"{step}: widget {e} not found")
+            break
+        rerun(step)
+    return at, timings, errors
+
+
+def _warm_up(app, timeout):
+    """작업 프로세스 시작: 모듈 import·첫 실행 비용을 측정에서 빼고 기준 RSS를 잰다"""
+    global _BASE_RSS
+    AppTest.from_file(app, default_timeout=timeout).run()
+    gc.collect()
+    _BASE_RSS = rss_bytes()
+
+
+def _ready(_):
+    return os.getpid()
+
+
+def run_worker(app, seeds, timeout):
+    """동시 세션 하나(작업 프로세스)가 seeds 수만큼 세션을 이어서 실행.
+    세션을 모두 살려 둔 채로 기준 대비 RSS 증가와 세션 상태(그래프 노드 값) 크기를 잰다"""
+    done = [run_session(app, seed, timeout) for seed in seeds]
+    gc.collect()
+    state = [nbytes(at.session_state["graph"].values()) for at, _, _ in done if "graph" in at.session_state]
+    return {
+        "timings": [timings for _, timings, _ in done],
+        "errors": [e for _, _, errs in done for e in errs],
+        "rss_per_session": (rss_bytes() - _BASE_RSS) / len(seeds),
+        "state_bytes": state,
+    }
+
+
+def run_level(app, concurrency, sessions, seed, timeout):
+    """동시 세션 concurrency개가 각각 세션 sessions개를 실행한 결과 dict"""
+    n = concurrency * sessions
+    seeds = [list(range(seed + w * sessions, seed + (w + 1) * sessions)) for w in range(concurrency)]
+    with ProcessPoolExecutor(max_workers=concurrency, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_warm_up, initargs=(app, timeout)) as pool:
+        # 모든 작업 프로세스가 데워진 뒤에 동시에 시작하도록 빈 작업을 먼저 한 바퀴
+        list(pool.map(_ready, range(concurrency)))
+        start = time.perf_counter()
+        workers = list(pool.map(run_worker, [app] * concurrency, seeds, [timeout] * concurrency))
+        wall = time.perf_counter() - start
+    runs = [timings for w in workers for timings in w["timings"]]
+    latencies = np.array([s for timings in runs for _, s in timings])
+    by_step = {}
+    for timings in runs:
+        for step, s in timings:
+            by_step.setdefault(step, []).append(s)
+    state = [b for w in workers for b in w["state_bytes"]]
+    errors = [e for w in workers for e in w["errors"]]
+    return {
+        "concurrency": concurrency,
+        "sessions": n,
+        "reruns": len(latencies),
+        "wall_seconds": wall,
+        "throughput": len(latencies) / wall,
+        "latency_ms": {f"p{p}": float(np.percentile(latencies, p)) * 1000 for p in PERCENTILES},
+        "latency_ms_mean": float(latencies.mean()) * 1000,
+        "step_p95_ms": {step: float(np.percentile(v, 95)) * 1000 for step, v in by_step.items()},
+        "rss_per_session": float(np.mean([w["rss_per_session"] for w in workers])),
+        "state_bytes_per_session": float(np.mean(state)) if state else 0.0,
+        "errors": errors,
+    }
+
+
+def capacity(levels, target_p95_ms):
+    """p95가 목표 이하이고 오류가 없는 가장 큰 동시 세션 수 (없으면 0)"""
+    ok = [lv["concurrency"] for lv in levels if lv["latency_ms"]["p95"] <= target_p95_ms and not lv["errors"]]
+    return max(ok, default=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python loadtest.py", description="동시 세션 부하 테스트")
+    parser.add_argument("--app", default=APP, help="대상 앱 스크립트 (기본: loan_rev7_eng.py)")
+    parser.add_argument("--concurrency", default="1,4,8", help="동시 세션 수 목록 (쉼표 구분)")
+    parser.add_argument("--sessions", type=int, default=2, help="동시 세션 하나가 이어서 실행할 세션 수")
+    parser.add_argument("--target-p95", type=float, default=1000.0, help="수용량 기준 rerun p95 (ms)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="rerun 한 번의 제한 시간 (초)")
+    parser.add_argument("--seed", type=int, default=0, help="입력값 난수 시드")
+    parser.add_argument("--out", default="loadtest.json", help="결과 JSON 파일 (기본: loadtest.json)")
+    args = parser.parse_args(argv)
+
+    try:
+        levels = sorted({int(c) for c in args.concurrency.split(",") if c})
+    except ValueError:
+        parser.error(f"동시 세션 수 목록이 잘못됨: {args.concurrency}")
+    app = os.path.abspath(args.app)
+    out = os.path.abspath(args.out)
+    # 앱이 만드는 시나리오 DB·타이밍 로그가 작업 폴더에 쌓이지 않도록 임시 폴더에서 실행
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            results = []
+            for c in levels:
+                lv = run_level(app, c, args.sessions, args.seed, args.timeout)
+                results.append(lv)
+                lat = lv["latency_ms"]
+                print(f"concurrency {c:>3}: {lv['reruns']:>4} reruns  {lv['throughput']:7.1f} rerun/s  "
+                      f"p50 {lat['p50']:7.1f}  p95 {lat['p95']:7.1f}  p99 {lat['p99']:7.1f} ms  "
+                      f"{lv['rss_per_session'] / 2**20:6.1f} MiB/session (state {lv['state_bytes_per_session'] / 2**10:,.0f} KiB)"
+                      f"{'  ' + str(len(lv['errors'])) + ' error(s)' if lv['errors'] else ''}", file=sys.stderr)
+        finally:
+            os.chdir(cwd)
+
+    doc = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "app": os.path.basename(app),
+        "steps": ["start"] + [step for step, _ in SESSION_STEPS],
+        "target_p95_ms": args.target_p95,
+        "capacity": capacity(results, args.target_p95),
+        "levels": results,
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+    print(f"capacity: {doc['capacity']} concurrent session(s) at p95 ≤ {args.target_p95:,.0f} ms → {out}", file=sys.stderr)
+    return 1 if any(lv["errors"] for lv in results) else 0
+
+
+if __name__ == "__main__":
+    # AppTest가 앱 스크립트를 __main__으로 실행하므로, 작업 프로세스로 보낼 함수는 모듈 이름으로 참조되게
+    from loadtest import main
+    sys.exit(main())
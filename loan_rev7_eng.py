@@ -1,7 +1,23 @@
+import os
+import time
+import uuid
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+
+from engine import (
+    MarketModel, ProjectionInputs, fan,
+    gross_to_net_list, net_to_gross_list, monthly_net_from_annual,
+    house_value_path,
+    Household, max_house_price, min_cash, latest_purchase_year,
+    ANNUITY, EQUAL_PRINCIPAL, BULLET, rate_path,
+    build_household_graph, loan_product_stage, sweep_stage, monte_carlo_stage, SpanRecorder, ScenarioStore,
+    DEFAULT_ACCOUNTS,
+)
+from engine.compare import compare_scenarios, deltas
+from ui.charts import render, stacked_bars, grouped_bars, line_chart, fan_chart, heatmap
+from ui.downsample import minmax_indices, lttb_indices
 
 # 스트림릿 페이지 설정
 st.set_page_config(page_title="예비 신혼부부 재정 분석", page_icon="💑")
@@ -12,39 +28,150 @@ def get_or_set(key, default):
         st.session_state[key] = default
     return st.session_state[key]
 
-start_year = 2024
-husband_last_year = get_or_set("husband_last_year", 2033)
-wife_last_year = get_or_set("wife_last_year", 2033)
-final_year = max(husband_last_year, wife_last_year, 2033)
-end_year = final_year
-months_sim = 12 * (end_year - start_year + 1)
-year_labels = [f"{y}" for y in range(start_year, end_year+1)]
-month_labels = [f"{start_year + i//12}Y {i%12+1}M" for i in range(months_sim)]  # 월 라벨 영어로
-
-def calc_net_salary_from_gross(gross):
-    return int(gross * 0.90)
-
-def gross_to_net_list(gross_list):
-    return [calc_net_salary_from_gross(g) for g in gross_list]
+def fit_state(key, options=None, low=None, high=None):
+    """보관된 위젯 값이 지금 선택지/범위를 벗어나면 (다른 페이지에서 기간을 줄였을 때 등) 맞게 고치기"""
+    if key not in st.session_state:
+        return
+    value = st.session_state[key]
+    if options is not None:
+        if isinstance(value, list):
+            st.session_state[key] = [v for v in value if v in options]
+        elif value not in options:
+            del st.session_state[key]
+    else:
+        st.session_state[key] = min(max(value, low), high)
 
-def monthly_net_from_annual(annual_gross):
-    monthly_gross = annual_gross / 12
-    net = calc_net_salary_from_gross(monthly_gross)
-    return [net] * 12
+WIDGET_VALUES = "widget_values"
 
-def apply_raise(base, rate, n):
-    return [x * (1+rate/100)**n for x in base]
+def widget_values():
+    """지금 session_state에 있는 화면 입력값 (계산 그래프/계측 객체, 보관소, 시나리오 패널 자신의 값 제외)"""
+    return {
+        k: v for k, v in st.session_state.items()
+        if k not in ("graph", "spans", WIDGET_VALUES) and not k.startswith("sc_")
+        and isinstance(v, (bool, int, float, str, list, tuple, dict, np.generic))
+    }
 
-def get_annual_list(base, rate, start_year, end_year):
-    return [apply_raise(base, rate, i) for i in range(end_year-start_year+1)]
+# 스트림릿은 이번 실행에 그리지 않은 위젯(다른 페이지)의 키를 지우므로, 실행마다 남아 있는 값을
+# 위젯이 아닌 키에 모아 두고 지워진 키는 그 값으로 되살린다 (페이지를 오가도, 시나리오를 불러와도 입력 유지)
+remembered = st.session_state.setdefault(WIDGET_VALUES, {})
+remembered.update(widget_values())
+for key, value in remembered.items():
+    if key not in st.session_state:
+        st.session_state[key] = value
+
+# 페이지 간 공유 계산 그래프 (입력이 바뀐 노드의 하위만 다시 계산)
+if "graph" not in st.session_state:
+    st.session_state.graph = build_household_graph()
+graph = st.session_state.graph
+graph.recomputed.clear()
+
+# 재실행 구간 계측 (계산/표/그림 단계별 소요 시간, 사이드바 패널과 선택적 JSON-lines 기록)
+if "spans" not in st.session_state:
+    st.session_state.spans = SpanRecorder(session_id=uuid.uuid4().hex[:8])
+spans = st.session_state.spans
+spans.begin()
+graph.trace = spans.span
+
+def chart(draw, **kwargs):
+    """그림 그리기(래스터화)와 전송을 나눠 계측하며 이미지 출력"""
+    with spans.span(f"render:{draw.__name__}"):
+        image = render(draw, **kwargs)
+    with spans.span("transport:image"):
+        st.image(image, width="stretch")
+
+CHART_POINTS = 240     # 차트 한 장에 그릴 최대 x 위치 수 (넘으면 다운샘플링)
+TABLE_PAGE_ROWS = 120  # 한 번에 보내는 표 행 수 (key를 준 표만 쪽 나눔)
+
+def table(df, formats=None, key=None, page_rows=TABLE_PAGE_ROWS):
+    """표 서식 적용과 전송을 나눠 계측하며 출력. key가 있고 page_rows보다 길면 고른 쪽만 전송"""
+    if key is not None and len(df) > page_rows:
+        n_pages = -(-len(df) // page_rows)
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > n_pages:
+            st.session_state[page_key] = n_pages
+        page_no = st.number_input(f"Table Page (1~{n_pages}, {page_rows} rows each)", min_value=1, max_value=n_pages, value=1, step=1, key=page_key)
+        df = df.iloc[(page_no - 1) * page_rows:page_no * page_rows]
+    if formats:
+        with spans.span("style.format"):
+            df = df.style.format(formats)
+    with spans.span("transport:dataframe"):
+        st.dataframe(df)
+if not graph.is_set("last_years"):
+    graph.set("last_years", (
+        st.session_state.get("husband_birth", 1990) + st.session_state.get("husband_retire_age", 60) - 1,
+        st.session_state.get("wife_birth", 1992) + st.session_state.get("wife_retire_age", 60) - 1,
+    ))
+
+# 시간축 (은퇴 연도로 정해지는 구간마다 하나를 공유, 라벨은 처음 쓸 때 생성)
+tl = graph.get("timeline")
+year_labels = tl.year_labels
 
 months = [f"{i}M" for i in range(1, 13)]  # x축 라벨을 M으로
 
 # 페이지 선택
 page = st.sidebar.selectbox(
     "페이지를 선택하세요",
-    ["월별 실수령액 시뮬레이션", "집 장만 시뮬레이션", "예상 가계부 시뮬레이션", "통합 자금흐름/잔액 분석"]
+    ["월별 실수령액 시뮬레이션", "집 장만 시뮬레이션", "예상 가계부 시뮬레이션", "통합 자금흐름/잔액 분석", "시나리오 비교"]
 )
+spans.label = page
+with st.sidebar.expander("⏱ Rerun Timings"):
+    if spans.last:
+        st.caption(f"Last rerun ({spans.last_label}): {spans.last_total*1000:,.1f} ms")
+        st.dataframe(pd.DataFrame(
+            [(name, calls, seconds * 1000) for name, calls, seconds in spans.breakdown()],
+            columns=["Span", "Calls", "ms"],
+        ), hide_index=True)
+    if st.checkbox("Log span timings (JSON lines)", key="span_log"):
+        os.makedirs("logs", exist_ok=True)
+        spans.log_path = os.path.join("logs", f"spans-{spans.session_id}.jsonl")
+        st.caption(f"→ {spans.log_path}")
+    else:
+        spans.log_path = None
+
+# ---- 시나리오 저장/불러오기 (화면 입력값 + 계산 결과를 SQLite 한 행에) ----
+@st.cache_resource
+def scenario_store():
+    return ScenarioStore()
+
+def session_inputs():
+    """저장할 화면 입력값: 모든 페이지의 마지막 값 + 지금 페이지의 현재 값"""
+    return {**st.session_state[WIDGET_VALUES], **widget_values()}
+
+def save_scenario():
+    name = st.session_state.sc_name.strip()
+    if not name:
+        st.session_state.sc_msg = "❗️Enter a scenario name"
+        return
+    inputs, values = graph.snapshot()
+    scenario_store().save(name, session_inputs(), inputs, values)
+    st.session_state.sc_msg = f"Saved '{name}'"
+
+def load_scenario():
+    name, widgets, inputs, values = scenario_store().load(st.session_state.sc_pick)
+    # 보관소를 저장된 값으로 바꿔 다른 페이지 위젯도 처음 그릴 때 이 값을 쓰게 (기본값으로 그래프를 덮지 않도록)
+    st.session_state[WIDGET_VALUES] = dict(widgets)
+    for key, value in widgets.items():
+        st.session_state[key] = value
+    graph.restore(inputs, values)
+    st.session_state.sc_msg = f"Loaded '{name}'"
+
+def delete_scenario():
+    scenario_store().delete(st.session_state.sc_pick)
+    st.session_state.sc_msg = "Deleted"
+
+with st.sidebar.expander("💾 Scenarios"):
+    st.text_input("Scenario Name", key="sc_name")
+    st.button("Save", on_click=save_scenario, key="sc_save")
+    search = st.text_input("Search", key="sc_search")
+    saved = scenario_store().list(search)
+    if saved:
+        names = {sid: f"{name} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(updated))})" for sid, name, updated in saved}
+        st.selectbox("Saved Scenarios", list(names), format_func=names.get, key="sc_pick")
+        colsc1, colsc2 = st.columns(2)
+        colsc1.button("Load", on_click=load_scenario, key="sc_load")
+        colsc2.button("Delete", on_click=delete_scenario, key="sc_delete")
+    if st.session_state.get("sc_msg"):
+        st.caption(st.session_state.sc_msg)
 
 # ---- 첫번째 페이지 ----
 if page == "월별 실수령액 시뮬레이션":
@@ -60,12 +187,10 @@ if page == "월별 실수령액 시뮬레이션":
         wife_retire_age = st.number_input("Wife Retirement Age", min_value=40, max_value=80, value=get_or_set("wife_retire_age", 60), key="wife_retire_age")
     husband_last_year = husband_birth + husband_retire_age - 1
     wife_last_year = wife_birth + wife_retire_age - 1
-    final_year = max(husband_last_year, wife_last_year)
-    current_year = 2024
-    years = [y for y in range(current_year, final_year+1)]
-    year_labels = [f"{y}" for y in years]
-    st.session_state["husband_last_year"] = husband_last_year
-    st.session_state["wife_last_year"] = wife_last_year
+    graph.set("last_years", (husband_last_year, wife_last_year))
+    tl = graph.get("timeline")
+    years = tl.years.tolist()
+    year_labels = tl.year_labels
 
     # --- 소득입력 ---
     st.markdown("#### 💙 Husband Income Input")
@@ -84,7 +209,7 @@ if page == "월별 실수령액 시뮬레이션":
         husband_gross_base = husband_gross
     else:
         husband_net = [st.number_input(f"Husband {m} Net (10,000 KRW)", min_value=0, value=get_or_set(f"h_n_{i}", 360), step=10, key=f"h_n_{i}") for i, m in enumerate(months)]
-        husband_gross_base = [val/0.9 for val in husband_net]
+        husband_gross_base = net_to_gross_list(husband_net)
     
     st.markdown("#### 💖 Wife Income Input")
     wife_mode = st.selectbox(
@@ -102,7 +227,7 @@ if page == "월별 실수령액 시뮬레이션":
         wife_gross_base = wife_gross
     else:
         wife_net = [st.number_input(f"Wife {m} Net (10,000 KRW)", min_value=0, value=get_or_set(f"w_n_{i}", 270), step=10, key=f"w_n_{i}") for i, m in enumerate(months)]
-        wife_gross_base = [val/0.9 for val in wife_net]
+        wife_gross_base = net_to_gross_list(wife_net)
     
     st.markdown("---")
     st.markdown("### 📈 Annual Raise Rate")
@@ -115,41 +240,36 @@ if page == "월별 실수령액 시뮬레이션":
     
     st.markdown("---")
     st.markdown("### 👶 Parental Leave")
-    st.markdown("#### Husband Parental Leave")
-    colh1, colh2, colh3 = st.columns(3)
-    with colh1:
-        saved_value = st.session_state.get("hy_start_year", years[0])
-        idx = years.index(saved_value) if saved_value in years else 0
-        hy_start_year = st.selectbox("Husband Leave Start Year", years, index=idx, key="hy_start_year")
-        # 이 아래 줄 완전히 삭제!
-        # st.session_state["hy_start_year"] = hy_start_year
-
-
-    with colh2:
-        saved_month = st.session_state.get("hy_start_month", 1)
-        idx = list(range(1, 13)).index(saved_month) if saved_month in range(1, 13) else 0
-        hy_start_month = st.selectbox("Husband Leave Start Month", list(range(1, 13)), index=idx, key="hy_start_month")
-        #st.session_state["hy_start_month"] = hy_start_month
-
-    with colh3:
-        hy_months = st.number_input("Husband Leave Months", min_value=0, max_value=36, value=get_or_set("hy_months", 0), key="hy_months")
-    st.markdown("#### Wife Parental Leave")
-    colw1, colw2, colw3 = st.columns(3)
-    with colw1:
-        saved_value = st.session_state.get("wy_start_year", years[0])
-        idx = years.index(saved_value) if saved_value in years else 0
-        wy_start_year = st.selectbox("Wife Leave Start Year", years, index=idx, key="wy_start_year")
-        # st.session_state["wy_start_year"] = wy_start_year  ← 이 줄 삭제!
-
-
-    with colw2:
-        saved_month = st.session_state.get("wy_start_month", 1)
-        idx = list(range(1, 13)).index(saved_month) if saved_month in range(1, 13) else 0
-        wy_start_month = st.selectbox("Wife Leave Start Month", list(range(1, 13)), index=idx, key="wy_start_month")
-        #st.session_state["wy_start_month"] = wy_start_month
-
-    with colw3:
-        wy_months = st.number_input("Wife Leave Months", min_value=0, max_value=36, value=get_or_set("wy_months", 0), key="wy_months")
+    def leave_window_inputs(prefix, who):
+        """소득자 한 명의 휴직 기간 입력 (여러 번 가능) → [(시작 연도, 시작 월, 개월 수)]"""
+        st.markdown(f"#### {who} Parental Leave")
+        count = st.number_input(f"{who} Leave Periods", min_value=1, max_value=6, value=get_or_set(f"{prefix}_count", 1), step=1, key=f"{prefix}_count")
+        windows = []
+        for i in range(count):
+            sfx = "" if i == 0 else f"_{i}"  # 첫 휴직은 예전 키 그대로
+            no = "" if i == 0 else f" #{i+1}"
+            colw1, colw2, colw3 = st.columns(3)
+            with colw1:
+                fit_state(f"{prefix}_start_year{sfx}", years)
+                saved_value = st.session_state.get(f"{prefix}_start_year{sfx}", years[0])
+                idx = years.index(saved_value) if saved_value in years else 0
+                start_year = st.selectbox(f"{who} Leave Start Year{no}", years, index=idx, key=f"{prefix}_start_year{sfx}")
+            with colw2:
+                saved_month = st.session_state.get(f"{prefix}_start_month{sfx}", 1)
+                idx = list(range(1, 13)).index(saved_month) if saved_month in range(1, 13) else 0
+                start_month = st.selectbox(f"{who} Leave Start Month{no}", list(range(1, 13)), index=idx, key=f"{prefix}_start_month{sfx}")
+            with colw3:
+                n_months = st.number_input(f"{who} Leave Months{no}", min_value=0, max_value=36, value=get_or_set(f"{prefix}_months{sfx}", 0), key=f"{prefix}_months{sfx}")
+            windows.append((start_year, start_month, n_months))
+        return windows
+
+    # (소득자 번호, 시작 연도, 시작 월, 개월 수) 목록
+    leaves = [(0, *w) for w in leave_window_inputs("hy", "Husband")] + [(1, *w) for w in leave_window_inputs("wy", "Wife")]
+    parents_bonus = st.checkbox(
+        "Apply parents' joint-leave bonus (3+3 / 6+6) when both take leave close together",
+        value=get_or_set("leave_bonus", True), key="leave_bonus",
+    )
+    st.caption("💡 *Leave pay follows the rule in force in each leave's start year (2022 / 2024 / 2025 rules).*")
     
     st.markdown("#### Parental Leave Pay Mode")
     leave_pay_mode = st.selectbox(
@@ -166,83 +286,41 @@ if page == "월별 실수령액 시뮬레이션":
             amt = st.number_input(f"{i+1}M", min_value=0, value=get_or_set(f"custom_leave_{i}", 150), step=1, key=f"custom_leave_{i}")
             custom_leave_pay.append(amt)
     
-    def get_parental_leave_pay(gross, idx):
-        if leave_pay_mode == "Manual Input (1~12M)" and custom_leave_pay is not None and idx < len(custom_leave_pay):
-            return custom_leave_pay[idx]
-        # Auto calc (government rule)
-        if idx < 3:  # 1~3M
-            pay = gross * 1.0
-            limit = 250
-        elif idx < 6:  # 4~6M
-            pay = gross * 1.0
-            limit = 200
-        else:
-            pay = gross * 0.8
-            limit = 150
-        result = int(pay * 0.9)
-        return min(result, limit)
-    
+    fit_state("net_salary_years_checked", year_labels)
     checked = st.multiselect("Select year(s) to check", year_labels, default=[year_labels[0]], key="net_salary_years_checked")
-    def yearly_net(base, rate, years):
-        return [gross_to_net_list(apply_raise(base, rate, i)) for i in range(len(years))]
-    
-    husband_years_net = yearly_net(husband_gross_base, husband_rate, years)
-    wife_years_net = yearly_net(wife_gross_base, wife_rate, years)
-    st.session_state['husband_years_net'] = husband_years_net
-    st.session_state['wife_years_net'] = wife_years_net
-
-    def insert_parental_leave(yearly_income, years, leave_start_year, leave_start_month, leave_months, base_gross, rate):
-        if leave_months == 0:
-            return yearly_income
-        try:
-            y_idx = years.index(leave_start_year)
-        except ValueError:
-            return yearly_income
-        m_idx = leave_start_month - 1
-        for i in range(leave_months):
-            cy = y_idx + (m_idx + i)//12
-            cm = (m_idx + i)%12
-            if cy < len(yearly_income):
-                gross = apply_raise(base_gross, rate, cy)[cm]
-                leave_pay = get_parental_leave_pay(gross, i)
-                yearly_income[cy][cm] = leave_pay
-        return yearly_income
-    
-    husband_years_net = insert_parental_leave(
-        husband_years_net, years, hy_start_year, hy_start_month, hy_months, husband_gross_base, husband_rate
-    )
-    wife_years_net = insert_parental_leave(
-        wife_years_net, years, wy_start_year, wy_start_month, wy_months, wife_gross_base, wife_rate
-    )
-    st.session_state['husband_years_net'] = husband_years_net
-    st.session_state['wife_years_net'] = wife_years_net
+    # 부부 세전 월급 (2 × 개월) → 세후, 휴직 기간 대체
+    graph.set("income_inputs", {"base_gross": [husband_gross_base, wife_gross_base], "rates": [husband_rate, wife_rate]})
+    graph.set("leave_inputs", {
+        "leaves": leaves,
+        "custom_leave_pay": custom_leave_pay,
+        "parents_bonus": parents_bonus,
+    })
+    net_monthly = graph.get("leave")
+    husband_years_net, wife_years_net = tl.by_year(net_monthly)
 
     if checked:
         for idx, label in enumerate(year_labels):
             if label in checked:
-                df = pd.DataFrame({
-                    "M": months,
-                    "Husband Net": husband_years_net[idx],
-                    "Wife Net": wife_years_net[idx],
-                    "Total": np.array(husband_years_net[idx]) + np.array(wife_years_net[idx])
-                })
+                with spans.span("dataframe"):
+                    df = pd.DataFrame({
+                        "M": months,
+                        "Husband Net": husband_years_net[idx],
+                        "Wife Net": wife_years_net[idx],
+                        "Total": husband_years_net[idx] + wife_years_net[idx]
+                    })
                 st.markdown(f"#### {label}Y Monthly Net Income")
-                st.dataframe(df)
-                fig, ax = plt.subplots(figsize=(8, 5))
-                ax.bar(df["M"], df["Husband Net"], label="Husband", color="#5B9BD5")
-                ax.bar(df["M"], df["Wife Net"], label="Wife", bottom=df["Husband Net"], color="#ED7D31")
-                for i, total in enumerate(df["Total"]):
-                    ax.text(i, total + 2, f"{int(total):,} ", ha='center', va='bottom', fontsize=6, fontweight='bold')
-                ax.set_ylabel("Monthly Net Salary ")
-                ax.set_xlabel("M")
-                ax.set_title(f"{label}Y Couple Monthly Net Income (Stacked, Parental Leave Applied)")
-                ax.legend()
-                st.pyplot(fig)
+                table(df)
+                chart(
+                    stacked_bars, figsize=(8, 5), x_labels=months,
+                    series=[("Husband", husband_years_net[idx], "#5B9BD5"), ("Wife", wife_years_net[idx], "#ED7D31")],
+                    totals=df["Total"].to_numpy(), xlabel="M", ylabel="Monthly Net Salary ",
+                    title=f"{label}Y Couple Monthly Net Income (Stacked, Parental Leave Applied)",
+                )
 
 # ---- 두번째 페이지 ----
 elif page == "집 장만 시뮬레이션":
     st.title("🏠 Home Purchase vs Jeonse Simulation")
-    house_mode = st.radio("Housing Option", ["Purchase", "Jeonse"], key="house_mode")
+    house_mode = st.radio("Housing Option", ["Purchase", "Jeonse", "Loan Sweep"], key="house_mode")
     if house_mode == "Purchase":
         st.subheader("🏡 Purchase Conditions")
         cash = st.number_input("Cash ", min_value=0, value=get_or_set("house_cash", 30000), step=100, key="house_cash")
@@ -252,6 +330,28 @@ elif page == "집 장만 시뮬레이션":
         loan_year = st.slider("Loan Term (Y)", min_value=10, max_value=40, value=get_or_set("loan_year", 30), key="loan_year")
         loan_rate = st.slider("Interest Rate (%)", min_value=2.0, max_value=8.0, value=get_or_set("loan_rate", 3.8), step=0.1, key="loan_rate")
         st.caption("※ 2024 typical rate: 3.5~4.5%")
+        st.markdown("#### 🏦 Loan Product")
+        repayment_labels = {ANNUITY: "Equal Payment (원리금균등)", EQUAL_PRINCIPAL: "Equal Principal (원금균등)", BULLET: "Bullet (만기일시)"}
+        colp1, colp2 = st.columns(2)
+        repayment = colp1.selectbox("Repayment Type", list(repayment_labels), format_func=repayment_labels.get, key="loan_repayment")
+        fit_state("loan_grace_year", low=0, high=loan_year - 1)
+        grace_year = colp2.number_input("Interest-only Grace Period (Y)", min_value=0, max_value=loan_year - 1, value=min(get_or_set("loan_grace_year", 0), loan_year - 1), step=1, key="loan_grace_year")
+        rate_type = st.radio("Rate Type", ["Fixed", "Mixed (Fixed → Variable)", "Stepped"], horizontal=True, key="loan_rate_type")
+        # 금리 변경 [(적용 시작 월 인덱스, 연 금리 %)]
+        if rate_type == "Mixed (Fixed → Variable)":
+            colr1, colr2 = st.columns(2)
+            fixed_year = colr1.slider("Fixed Period (Y)", min_value=1, max_value=10, value=get_or_set("loan_fixed_year", 5), key="loan_fixed_year")
+            variable_rate = colr2.slider("Variable Rate after Fixed Period (%)", min_value=1.0, max_value=10.0, step=0.1, value=get_or_set("loan_variable_rate", 4.5), key="loan_variable_rate")
+            rate_changes = ((fixed_year * 12, variable_rate),)
+        elif rate_type == "Stepped":
+            colr1, colr2 = st.columns(2)
+            step_year = colr1.slider("Rate Changes Every (Y)", min_value=1, max_value=10, value=get_or_set("loan_step_year", 3), key="loan_step_year")
+            step_size = colr2.slider("Change per Step (%p)", min_value=-1.0, max_value=1.0, step=0.05, value=get_or_set("loan_step_size", 0.25), key="loan_step_size")
+            rate_changes = tuple(
+                (i * step_year * 12, round(max(loan_rate + i * step_size, 0.0), 2)) for i in range(1, -(-loan_year // step_year))
+            )
+        else:
+            rate_changes = ()
         if house_price > 0:
             leverage = need_loan / house_price
             st.info(f"💸 **Leverage: {leverage*100:.1f}%** (Loan/Total)")
@@ -259,53 +359,61 @@ elif page == "집 장만 시뮬레이션":
         up_rate = st.slider("House Price Annual Up (%)", min_value=-5.0, max_value=10.0, value=get_or_set("house_up_rate", 3.0), step=0.1, key="house_up_rate")
         dn_rate = st.slider("House Price Annual Down (%)", min_value=-10.0, max_value=0.0, value=get_or_set("house_dn_rate", -2.0), step=0.1, key="house_dn_rate")
         period = st.slider("Simulation Years", min_value=1, max_value=30, value=get_or_set("house_period", 10), key="house_period")
-        r = loan_rate / 100 / 12
-        n = loan_year * 12
-        if r > 0 and need_loan > 0:
-            monthly_payment = need_loan * 10000 * r * (1 + r) ** n / ((1 + r) ** n - 1)
-            monthly_payment = int(monthly_payment // 10) * 10
-        else:
-            monthly_payment = 0
-        st.write(f"📅 Monthly Loan Repayment: **{monthly_payment/10000:,.1f} **")
-        # 이 부분 추가!
-        st.session_state['last_housing_payment'] = int(monthly_payment/10000)
+        months = max(loan_year, period) * 12
+        with spans.span("compute:loan_schedule"):
+            schedule = loan_product_stage(
+                need_loan, rate_path(months, loan_rate, rate_changes), loan_year * 12, repayment, grace_year * 12,
+                months=months,
+            )
+        term = slice(0, loan_year * 12)
+        first_due = grace_year * 12  # 원금 상환이 시작되는 달
+        colm1, colm2, colm3 = st.columns(3)
+        colm1.metric("First Payment" if not grace_year else "Payment during Grace", f"{schedule.payment[0]:,.1f}")
+        colm2.metric("Payment after Grace" if grace_year else "Max Payment", f"{schedule.payment[first_due] if grace_year else schedule.payment[term].max():,.1f}")
+        colm3.metric("Total Interest", f"{schedule.cum_interest[loan_year * 12 - 1]:,.0f}")
+        # 대출 조건 → 가계부 주거비(월별 상환 스케줄)로 사용
+        graph.set("loan_inputs", {
+            "price": house_price, "cash": cash, "need_loan": need_loan,
+            "loan_rate": loan_rate, "loan_year": loan_year, "up_rate": up_rate,
+            "repayment": repayment, "grace_months": grace_year * 12, "rate_changes": rate_changes,
+        })
+        graph.set("housing_payment", int(schedule.payment[first_due]))
+        chart(
+            stacked_bars, figsize=(10, 4), x_labels=[str(y) for y in range(1, loan_year + 1)],
+            series=[
+                ("Interest", schedule.interest[term].reshape(loan_year, 12).sum(axis=1), "#ED7D31"),
+                ("Principal", schedule.principal[term].reshape(loan_year, 12).sum(axis=1), "#5B9BD5"),
+            ],
+            xlabel="Loan Y", ylabel="Annual Repayment ", title=f"Annual Repayment ({repayment_labels[repayment].split(' (')[0]}, {rate_type})",
+        )
 
         years = np.arange(1, period+1)
-        house_up = [house_price * ((1 + up_rate/100) ** i) for i in years]
-        house_dn = [house_price * ((1 + dn_rate/100) ** i) for i in years]
-        loan_balance = []
-        cur_balance = need_loan * 10000
-        for i in years:
-            if r > 0:
-                remain = cur_balance * ((1 + r) ** (n) - (1 + r) ** (i * 12)) / ((1 + r) ** (n) - 1)
-            else:
-                remain = max(cur_balance - monthly_payment * 12 * i, 0)
-            loan_balance.append(remain / 10000)
-        equity_up = [up - loan_balance[i] for i, up in enumerate(house_up)]
-        equity_dn = [dn - loan_balance[i] for i, dn in enumerate(house_dn)]
-        df = pd.DataFrame({
-            "Y": years,
-            "House (Up)": house_up,
-            "House (Down)": house_dn,
-            "Loan Left": loan_balance,
-            "Net Assets (Up)": equity_up,
-            "Net Assets (Down)": equity_dn
-        })
-        st.dataframe(df.style.format({
+        house_up = house_value_path(house_price, up_rate, years)
+        house_dn = house_value_path(house_price, dn_rate, years)
+        loan_balance = schedule.balance[years * 12 - 1]
+        equity_up = house_up - loan_balance
+        equity_dn = house_dn - loan_balance
+        with spans.span("dataframe"):
+            df = pd.DataFrame({
+                "Y": years,
+                "House (Up)": house_up,
+                "House (Down)": house_dn,
+                "Loan Left": loan_balance,
+                "Net Assets (Up)": equity_up,
+                "Net Assets (Down)": equity_dn
+            })
+        table(df, {
             "House (Up)": "{:,.0f}",
             "House (Down)": "{:,.0f}",
             "Loan Left": "{:,.0f}",
             "Net Assets (Up)": "{:,.0f}",
             "Net Assets (Down)": "{:,.0f}",
-        }))
-        fig, ax = plt.subplots(figsize=(7, 4))
-        ax.plot(df["Y"], df["Net Assets (Up)"], marker='o', label="Net Assets (Up)")
-        ax.plot(df["Y"], df["Net Assets (Down)"], marker='o', label="Net Assets (Down)")
-        ax.set_xlabel("Y")
-        ax.set_ylabel("Net Assets ")
-        ax.set_title("Net Assets Scenario (Buy House)")
-        ax.legend()
-        st.pyplot(fig)
+        })
+        chart(
+            line_chart, figsize=(7, 4), x=years,
+            series=[("Net Assets (Up)", equity_up, None), ("Net Assets (Down)", equity_dn, None)],
+            xlabel="Y", ylabel="Net Assets ", title="Net Assets Scenario (Buy House)",
+        )
         st.caption("""
         **Note:**  
         - Taxes, fees, living cost, rent, actual salary/saving not included.
@@ -320,24 +428,57 @@ elif page == "집 장만 시뮬레이션":
         #### ⚖️ Jeonse = Deposit + Cash
         - No risk of loss/leverage/price change.
         """)
-        st.session_state['last_housing_payment'] = 0
+        graph.set("loan_inputs", None)
+        graph.set("housing_payment", 0)
+    elif house_mode == "Loan Sweep":
+        st.subheader("🧮 Loan Parameter Sweep")
+        cols1, cols2 = st.columns(2)
+        with cols1:
+            sw_rate = st.slider("Interest Rate Range (%)", min_value=1.0, max_value=10.0, value=get_or_set("sw_rate", (2.5, 6.0)), step=0.1, key="sw_rate")
+            sw_term = st.slider("Loan Term Range (Y)", min_value=5, max_value=50, value=get_or_set("sw_term", (10, 40)), key="sw_term")
+            sw_horizon = st.slider("Equity After (Y)", min_value=1, max_value=40, value=get_or_set("sw_horizon", 10), key="sw_horizon")
+        with cols2:
+            sw_price = st.slider("Purchase Price Range ", min_value=10000, max_value=300000, value=get_or_set("sw_price", (50000, 120000)), step=1000, key="sw_price")
+            sw_cash = st.slider("Cash Range ", min_value=0, max_value=200000, value=get_or_set("sw_cash", (20000, 50000)), step=1000, key="sw_cash")
+            sw_growth = st.slider("House Price Annual Change (%)", min_value=-5.0, max_value=10.0, value=get_or_set("sw_growth", 2.0), step=0.1, key="sw_growth")
+        rates = np.round(np.arange(sw_rate[0], sw_rate[1] + 1e-9, 0.1), 2)
+        terms = np.arange(sw_term[0], sw_term[1] + 1)
+        prices = np.linspace(sw_price[0], sw_price[1], 21)
+        cashes = np.linspace(sw_cash[0], sw_cash[1], 11)
+        with spans.span("compute:sweep"):
+            grid = sweep_stage(rates, terms, prices, cashes, sw_horizon, sw_growth)
+        st.caption(f"※ {grid.payment.size:,} combinations evaluated")
+
+        metric = st.selectbox("Metric", ["Monthly Payment", "Total Interest", f"Net Assets after {sw_horizon}Y"], key="sw_metric")
+        values = {"Monthly Payment": grid.payment, "Total Interest": grid.total_interest}.get(metric, grid.equity)
+        colsel1, colsel2 = st.columns(2)
+        with colsel1:
+            sel_price = st.select_slider("Price (for Rate × Term map)", options=list(prices), value=prices[len(prices)//2], format_func=lambda v: f"{v:,.0f}", key="sw_sel_price")
+        with colsel2:
+            sel_cash = st.select_slider("Cash (for Rate × Term map)", options=list(cashes), value=cashes[0], format_func=lambda v: f"{v:,.0f}", key="sw_sel_cash")
+        pi = int(np.argmin(np.abs(prices - sel_price)))
+        ci = int(np.argmin(np.abs(cashes - sel_cash)))
+        chart(
+            heatmap, figsize=(8, 5), z=values[:, :, pi, ci].T, x_values=rates, y_values=terms,
+            xlabel="Interest Rate (%)", ylabel="Loan Term (Y)",
+            title=f"{metric} (Price {sel_price:,.0f} / Cash {sel_cash:,.0f})",
+        )
+        cur_loan = graph.input("loan_inputs") or {}
+        ri = int(np.argmin(np.abs(rates - cur_loan.get("loan_rate", 3.8))))
+        ti = int(np.argmin(np.abs(terms - cur_loan.get("loan_year", 30))))
+        chart(
+            heatmap, figsize=(8, 5), z=values[ri, ti].T, x_values=prices, y_values=cashes,
+            xlabel="Purchase Price ", ylabel="Cash ",
+            title=f"{metric} (Rate {rates[ri]:.1f}% / Term {terms[ti]}Y)",
+        )
 # ---- 세번째 페이지 ----
 elif page == "예상 가계부 시뮬레이션":
     st.title("📝 Expected Budget Simulation")
-    husband_last_year = st.session_state.get("husband_last_year", 2033)
-    wife_last_year = st.session_state.get("wife_last_year", 2033)
-    final_year = max(husband_last_year, wife_last_year, 2033)
-    start_year = 2024
-    end_year = final_year
-    months_sim = 12 * (end_year - start_year + 1)
-    year_labels = [f"{y}" for y in range(start_year, end_year+1)]
-    month_labels = [f"{start_year + i//12}Y {i%12+1}M" for i in range(months_sim)]
-
     st.markdown("#### 1. Inflation Rate")
     inflation = st.slider("Annual Inflation (%)", min_value=0.0, max_value=10.0, step=0.1, value=get_or_set("inflation", 2.2), key="inflation")
     st.markdown("---")
     st.markdown("#### 2. Child Plan")
-    num_children = st.selectbox("Expected Number of Children (max 3)", [0, 1, 2, 3], index=get_or_set("num_children", 1), key="num_children")
+    num_children = st.number_input("Expected Number of Children", min_value=0, value=get_or_set("num_children", 1), step=1, key="num_children")
     child_plan = []
     for i in range(num_children):
         st.markdown(f"##### Child {i+1} Birth")
@@ -367,35 +508,6 @@ elif page == "예상 가계부 시뮬레이션":
     - (의식주, 교육비 포함, 사교육/특별 이벤트 제외 평균치, 실제는 가정별 차이)
     """)
 
-    # 육아비 공식: 월별로 20년간 120만원(연마다 물가상승률 반영)
-    def get_childcare_cost(start_year, start_month, months, inflation=2.2):
-        """출생연도·월부터 22세까지, 연령별로 차등. start_month는 1~12"""
-        costs = np.zeros(months)
-        for i in range(months):
-            cur_year = 2024 + (i // 12)
-            cur_month = (i % 12) + 1
-            # 자녀의 만 나이 (개월)
-            age_month = (cur_year - start_year) * 12 + (cur_month - start_month)
-            if age_month < 0 or age_month >= 12 * 23:  # 만 0세~22세까지만 반영
-                continue
-            # 나이구간별 기준
-            if age_month < 36:       # 0~2세
-                base = 60
-            elif age_month < 84:     # 3~6세
-                base = 80
-            elif age_month < 156:    # 7~12세
-                base = 100
-            elif age_month < 228:    # 13~18세
-                base = 140
-            elif age_month < 276:    # 19~22세(대학생)
-                base = 180
-            else:
-                base = 0
-            # 인플레이션 반영(기준은 '현재년도-2024')
-            year_offset = cur_year - 2024
-            costs[i] = base * ((1 + inflation / 100) ** year_offset)
-        return costs
-
     st.markdown("---")
     st.markdown("#### 3. 고정비/변동비(수정·추가 가능)")
     # 기본 예시
@@ -431,56 +543,36 @@ elif page == "예상 가계부 시뮬레이션":
 
     # ---- 부동산비용 자동입력
     st.markdown("##### 주거비(자동 입력)")
-    if "last_housing_payment" in st.session_state:
-        housing_payment = st.session_state.last_housing_payment
-    else:
+    housing_payment = graph.input("housing_payment")
+    if housing_payment is None:
         housing_payment = st.number_input("월 주거비(대출상환/전세/월세)", min_value=0, value=130, step=1)
-    st.session_state.last_housing_payment = housing_payment
+        graph.set("housing_payment", housing_payment)
+    graph.set("inflation", inflation)
+    graph.set("children", child_plan)
+    graph.set("budget_inputs", {"fixed": dict(st.session_state.fixed_expenses), "var": dict(st.session_state.var_expenses)})
+    loan = graph.get("loan")
+    if loan is not None:
+        st.caption(f"대출 상환 스케줄 적용: 월 {loan.payment[0]:,.1f}만원 × {np.count_nonzero(loan.payment)}개월")
 
     # 각 항목 월별 배열
-    fixed_arr = np.zeros(months_sim)
-    var_arr = np.zeros(months_sim)
-    childcare_arr = np.zeros(months_sim)
-    housing_arr = np.zeros(months_sim)
-
-    # 고정비
-    for v in st.session_state.fixed_expenses.values():
-        for i in range(months_sim):
-            year_offset = i // 12
-            fixed_arr[i] += v * ((1 + inflation / 100) ** year_offset)
-    # 변동비
-    for v in st.session_state.var_expenses.values():
-        for i in range(months_sim):
-            year_offset = i // 12
-            var_arr[i] += v * ((1 + inflation / 100) ** year_offset)
-    # 주거비
-    for i in range(months_sim):
-        year_offset = i // 12
-        housing_arr[i] += housing_payment * ((1 + inflation / 100) ** year_offset)
-    # 육아비
-    for (cy, cm) in child_plan:
-        # cy=출생연도, cm=출생월(1~12)
-        arr = get_childcare_cost(cy, cm, months_sim, inflation=inflation)
-        childcare_arr += arr
-
-    total_arr = fixed_arr + var_arr + childcare_arr + housing_arr
+    budget = graph.get("budget")
 
     # DataFrame
-    df = pd.DataFrame({
-        "월": month_labels,
-        "고정비합": fixed_arr,
-        "변동비합": var_arr,
-        "육아비합": childcare_arr,
-        "주거비합": housing_arr,
-        "합계": total_arr
-    })
-
-    st.session_state['expense_df'] = df
+    with spans.span("dataframe"):
+        df = pd.DataFrame({
+            "월": tl.month_labels,
+            "고정비합": budget["fixed"],
+            "변동비합": budget["var"],
+            "육아비합": budget["childcare"],
+            "주거비합": budget["housing"],
+            "합계": budget["total"]
+        })
 
     # ---- 연도별 선택 ----
 
     # 아래는 그래프 부분만 예시
     color_map = ["#5B9BD5", "#ED7D31", "#A9D18E", "#FFD966"]
+    fit_state("expense_years_checked", year_labels)
     checked = st.multiselect("Select year(s) to check", year_labels, default=[year_labels[0]], key="expense_years_checked")
 
     # ... fixed/var/housing/childcare cost 계산 및 DataFrame 생성 (생략)
@@ -488,134 +580,275 @@ elif page == "예상 가계부 시뮬레이션":
     for year_label in checked:
         year = int(year_label)
         st.markdown(f"#### {year}Y Monthly Expenses")
-        idx_start = (year - start_year) * 12
-        idx_end = idx_start + 12
-        df_year = df.iloc[idx_start:idx_end].copy()
+        df_year = df.iloc[tl.year_slice(year)].copy()
         df_year.reset_index(drop=True, inplace=True)
 
-        fig, ax = plt.subplots(figsize=(8, 5))
-        x = np.arange(12)
-        b1 = ax.bar(x, df_year["고정비합"], label="Fixed Cost", color=color_map[0])
-        b2 = ax.bar(x, df_year["변동비합"], bottom=df_year["고정비합"], label="Variable Cost", color=color_map[1])
-        b3 = ax.bar(x, df_year["육아비합"], bottom=df_year["고정비합"]+df_year["변동비합"], label="Childcare", color=color_map[2])
-        b4 = ax.bar(x, df_year["주거비합"], bottom=df_year["고정비합"]+df_year["변동비합"]+df_year["육아비합"], label="Housing", color=color_map[3])
-        for i, total in enumerate(df_year["합계"]):
-            ax.text(i, total + 2, f"{int(total):,} ", ha='center', va='bottom', fontsize=6, fontweight='bold')
-        ax.set_xticks(x)
-        ax.set_xticklabels([f"M{i+1}" for i in range(12)])  # x라벨 M으로!
-        ax.set_ylabel("Monthly Expenses ")
-        ax.set_xlabel("M")
-        ax.set_title(f"{year}Y Monthly Expenses (Stacked, Inflation Applied)")
-        ax.legend()
-        st.pyplot(fig)
-        st.dataframe(df_year)
+        chart(
+            stacked_bars, figsize=(8, 5), x_labels=[f"M{i+1}" for i in range(12)],  # x라벨 M으로!
+            series=[(name, df_year[col].to_numpy(), color) for (name, col), color in zip(
+                [("Fixed Cost", "고정비합"), ("Variable Cost", "변동비합"), ("Childcare", "육아비합"), ("Housing", "주거비합")],
+                color_map)],
+            totals=df_year["합계"].to_numpy(), xlabel="M", ylabel="Monthly Expenses ",
+            title=f"{year}Y Monthly Expenses (Stacked, Inflation Applied)",
+        )
+        table(df_year)
 
 # ---- 네번째 페이지 ----
 elif page == "통합 자금흐름/잔액 분석":
     st.title("💰 Integrated Cash Flow/Balance Analysis")
-    husband_years_net = st.session_state.get('husband_years_net')
-    wife_years_net = st.session_state.get('wife_years_net')
-    df = st.session_state.get('expense_df')
-
-    if husband_years_net is None or wife_years_net is None or df is None:
+    if not graph.ready("cashflow"):
         st.error("❗️First enter/generate data on Page 1 (Net Salary) and Page 3 (Budget)!")
         st.stop()
+    cashflow = graph.get("cashflow")
+    budget = graph.get("budget")
 
     view_mode = st.radio("View by", ["Yearly", "Monthly"], horizontal=True, key="view_mode")
     options = st.multiselect("Select items", ["Income", "Expense", "Net (Savable)"], default=["Income", "Expense", "Net (Savable)"], key="cf_options")
-    all_years = [int(y) for y in year_labels]
-    income_monthly = []
-    for i, y in enumerate(all_years):
-        income_monthly.extend(np.array(husband_years_net[i]) + np.array(wife_years_net[i]))
-    expense_monthly = df["합계"].tolist()
-    net_monthly = np.array(income_monthly) - np.array(expense_monthly)
+    all_years = tl.years.tolist()
+    income_monthly, expense_monthly, net_monthly = cashflow["income"], cashflow["expense"], cashflow["net"]
 
     if view_mode == "Yearly":
-        years = [int(y) for y in year_labels]
-        n_years = len(years)
-        income_annual = [sum(income_monthly[i*12:(i+1)*12]) for i in range(n_years)]
-        expense_annual = [sum(expense_monthly[i*12:(i+1)*12]) for i in range(n_years)]
-        net_annual = [sum(net_monthly[i*12:(i+1)*12]) for i in range(n_years)]
-        width = 0.25
-        x = np.arange(n_years)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        offset = 0
-        if "Income" in options:
-            ax.bar(x + offset, income_annual, width, label="Income", color="#5B9BD5")
-            offset += width
-        if "Expense" in options:
-            ax.bar(x + offset, expense_annual, width, label="Expense", color="#ED7D31")
-            offset += width
-        if "Net (Savable)" in options:
-            ax.bar(x + offset, net_annual, width, label="Net (Savable)", color="#A9D18E")
-        ax.set_xticks(x + width)
-        ax.set_xticklabels(year_labels, fontsize=10, rotation=45)
-        ax.set_ylabel("Annual Amount ")
-        ax.set_xlabel("Y")
-        ax.set_title("Annual Income / Expense / Net Savings")
-        ax.legend()
-        st.pyplot(fig)
-        summary_df = pd.DataFrame({
-            "Y": year_labels,
-            "Income": income_annual,
-            "Expense": expense_annual,
-            "Net (Savable)": net_annual
-        })
-        st.dataframe(summary_df)
+        income_annual = tl.yearly(income_monthly)
+        expense_annual = tl.yearly(expense_monthly)
+        net_annual = tl.yearly(net_monthly)
+        chart(
+            grouped_bars, figsize=(10, 6), x_labels=year_labels,
+            series=[(name, values, color) for name, values, color in [
+                ("Income", income_annual, "#5B9BD5"),
+                ("Expense", expense_annual, "#ED7D31"),
+                ("Net (Savable)", net_annual, "#A9D18E"),
+            ] if name in options],
+            xlabel="Y", ylabel="Annual Amount ", title="Annual Income / Expense / Net Savings",
+        )
+        with spans.span("dataframe"):
+            summary_df = pd.DataFrame({
+                "Y": year_labels,
+                "Income": income_annual,
+                "Expense": expense_annual,
+                "Net (Savable)": net_annual
+            })
+        table(summary_df)
     else:
-        min_year = all_years[0]
         max_year = all_years[-1]
+        fit_state("cf_sel_start_year", all_years)
         sel_start_year = st.selectbox("Start Year", all_years, index=0, key="cf_sel_start_year")
-        sel_period = st.slider("How many years?", min_value=1, max_value=min(5, max_year-sel_start_year+1), value=1, key="cf_sel_period")
-        start_idx = (sel_start_year - min_year) * 12
-        end_idx = start_idx + sel_period*12
-        sel_month_labels = [f"{min_year + (i//12)}Y {i%12+1}M" for i in range(start_idx, end_idx)]
-        sel_income_monthly = income_monthly[start_idx:end_idx]
-        sel_expense_monthly = expense_monthly[start_idx:end_idx]
-        sel_net_monthly = net_monthly[start_idx:end_idx]
-        fig, ax = plt.subplots(figsize=(max(10, sel_period*5), 5))
-        x = np.arange(len(sel_month_labels))
-        width = 0.25
-        offset = 0
-        label_shown = False
-        if "Income" in options:
-            ax.bar(x + offset, sel_income_monthly, width, label="Income", color="#5B9BD5")
-            offset += width
-            label_shown = True
-        if "Expense" in options:
-            ax.bar(x + offset, sel_expense_monthly, width, label="Expense", color="#ED7D31")
-            offset += width
-            label_shown = True
-        if "Net (Savable)" in options:
-            ax.bar(x + offset, sel_net_monthly, width, label="Net (Savable)", color="#A9D18E")
-            label_shown = True
-        ax.set_xticks(x + width)
-        step = max(1, len(sel_month_labels)//20)
-        ax.set_xticklabels([sel_month_labels[i] if i%step==0 else "" for i in range(len(sel_month_labels))], rotation=45, fontsize=8)
-        ax.set_ylabel("Monthly Amount ")
-        ax.set_xlabel("Y, M")
-        ax.set_title(f"{sel_start_year}Y~{sel_start_year+sel_period-1}Y Monthly Income / Expense / Net Savings")
-        if label_shown:
-            ax.legend()
-        st.pyplot(fig)
+        fit_state("cf_sel_period", low=1, high=max_year - sel_start_year + 1)
+        sel_period = st.slider("How many years?", min_value=1, max_value=max_year-sel_start_year+1, value=1, key="cf_sel_period")
+        sel = tl.year_slice(sel_start_year, sel_period)
+        sel_month_labels = tl.month_labels[sel]
+        sel_income_monthly = income_monthly[sel]
+        sel_expense_monthly = expense_monthly[sel]
+        sel_net_monthly = net_monthly[sel]
+        bar_series = [(name, values, color) for name, values, color in [
+            ("Income", sel_income_monthly, "#5B9BD5"),
+            ("Expense", sel_expense_monthly, "#ED7D31"),
+            ("Net (Savable)", sel_net_monthly, "#A9D18E"),
+        ] if name in options]
+        # 점 예산을 넘으면 막대는 구간별 최소/최대 달만 남김 (모든 항목이 같은 달을 쓰도록 위치를 합침)
+        with spans.span("downsample"):
+            bar_idx = minmax_indices([v for _, v, _ in bar_series] or [sel_net_monthly],
+                                     CHART_POINTS // (2 * max(len(bar_series), 1)))
+        bar_labels = [sel_month_labels[i] for i in bar_idx]
+        chart(
+            grouped_bars, figsize=(min(max(10, len(bar_idx) * 5 / 12), 25), 5), x_labels=bar_labels,
+            series=[(name, values[bar_idx], color) for name, values, color in bar_series],
+            xlabel="Y, M", ylabel="Monthly Amount ", label_step=max(1, len(bar_idx)//20), fontsize=8,
+            title=f"{sel_start_year}Y~{sel_start_year+sel_period-1}Y Monthly Income / Expense / Net Savings",
+        )
+        if len(bar_idx) < len(sel_month_labels):
+            st.caption(f"※ {len(sel_month_labels):,} months shown as {len(bar_idx):,} bars (min/max month per bucket)")
 
         st.markdown("#### 💹 Cumulative Net Cash Flow")
         cumulative = np.cumsum(sel_net_monthly)
-        fig2, ax2 = plt.subplots(figsize=(max(10, sel_period*5), 3))
-        ax2.plot(x, cumulative, color="#7030A0", marker="o")
-        ax2.axhline(0, color="gray", linestyle="--", linewidth=1)
-        ax2.set_xticks(x)
-        ax2.set_xticklabels([sel_month_labels[i] if i%step==0 else "" for i in range(len(sel_month_labels))], rotation=45, fontsize=8)
-        ax2.set_ylabel("Cumulative Cash Flow ")
-        ax2.set_xlabel("Y, M")
-        ax2.set_title("Cumulative Net Cash Flow (Monthly Net Savings)")
-        st.pyplot(fig2)
-
-        month_df = pd.DataFrame({
-            "M": sel_month_labels,
-            "Income": sel_income_monthly,
-            "Expense": sel_expense_monthly,
-            "Net (Savable)": sel_net_monthly,
-            "Cumulative": cumulative
-        })
-        st.dataframe(month_df)
+        with spans.span("downsample"):
+            line_idx = lttb_indices(np.arange(len(cumulative)), cumulative, CHART_POINTS)
+        chart(
+            line_chart, figsize=(min(max(10, len(line_idx) * 5 / 12), 25), 3), x=line_idx,
+            series=[("Cumulative", cumulative[line_idx], "#7030A0")], zero_line=True,
+            x_labels=[sel_month_labels[i] for i in line_idx], label_step=max(1, len(line_idx)//20),
+            marker='o' if len(line_idx) <= 120 else None,
+            xlabel="Y, M", ylabel="Cumulative Cash Flow ", title="Cumulative Net Cash Flow (Monthly Net Savings)",
+        )
+
+        with spans.span("dataframe"):
+            month_df = pd.DataFrame({
+                "M": sel_month_labels,
+                "Income": sel_income_monthly,
+                "Expense": sel_expense_monthly,
+                "Net (Savable)": sel_net_monthly,
+                "Cumulative": cumulative
+            })
+        table(month_df, key="cf_month_table")
+
+    # ---- 순자산 (저축·투자 계좌 + 집) ----
+    st.markdown("---")
+    st.markdown("#### 🏦 Net Worth (Savings / Investment Accounts + House Equity)")
+    with st.expander("Account Settings"):
+        accounts = []
+        for i, acc in enumerate(DEFAULT_ACCOUNTS):
+            cola1, cola2 = st.columns(2)
+            share = cola1.slider(f"{acc.name}: Share of Monthly Surplus (%)", min_value=0, max_value=100, step=5, value=get_or_set(f"nw_share_{i}", int(acc.share * 100)), key=f"nw_share_{i}")
+            ret = cola2.slider(f"{acc.name}: Annual Return (%)", min_value=-5.0, max_value=15.0, step=0.1, value=get_or_set(f"nw_return_{i}", float(acc.annual_return)), key=f"nw_return_{i}")
+            accounts.append(tuple(acc._replace(share=share / 100, annual_return=ret)))
+        st.caption(
+            "※ Deposit: interest taxed 15.4% as it accrues · Index Fund: 15.4% on gains when sold · "
+            "Pension: 13.2% tax credit on up to 6,000,000 KRW/yr reinvested each Feb, 5.5% pension tax on withdrawal. "
+            "The rest of the surplus and all deficits stay in cash (no return)."
+        )
+    if sum(a[1] for a in accounts) > 1:
+        st.error("❗️Account shares add up to more than 100%.")
+    else:
+        graph.set("accounts", tuple(accounts))
+        nw = graph.get("networth")
+        year_end = slice(11, None, 12)
+        nw_series = [("Net Worth", nw.total[year_end], "#000000")]
+        nw_series += [(name, values[year_end], None) for name, values in zip([a[0] for a in accounts], nw.accounts)]
+        nw_series.append(("Cash", nw.cash[year_end], "#A5A5A5"))
+        if graph.input("loan_inputs") is not None:
+            nw_series.append(("House Equity", (nw.house - nw.loan)[year_end], "#C55A11"))
+        chart(
+            line_chart, figsize=(10, 4), x=tl.years, series=nw_series, zero_line=True, marker=None,
+            xlabel="Y", ylabel="Amount ", title="Year-end Net Worth (after tax)",
+        )
+        with spans.span("dataframe"):
+            nw_df = pd.DataFrame({"Y": year_labels, **{name: values for name, values, _ in nw_series}})
+        table(nw_df, {name: "{:,.0f}" for name, _, _ in nw_series})
+
+    # ---- 목표 역산 ----
+    st.markdown("---")
+    st.markdown("#### 🎯 Goal Seek (Affordable House Price)")
+    if st.checkbox("Run Goal Seek", key="gs_enabled"):
+        house_inputs = graph.input("loan_inputs") or {}
+        colg1, colg2 = st.columns(2)
+        with colg1:
+            gs_min_balance = st.number_input("Cumulative Balance Never Below ", value=get_or_set("gs_min_balance", 0), step=100, key="gs_min_balance")
+            gs_use_dsr = st.checkbox("Limit DSR", value=get_or_set("gs_use_dsr", True), key="gs_use_dsr")
+            gs_max_dsr = st.slider("Max DSR (%)", min_value=10, max_value=70, value=get_or_set("gs_max_dsr", 40), key="gs_max_dsr", disabled=not gs_use_dsr)
+            gs_growth = st.slider("House Price Annual Change (%)", min_value=-5.0, max_value=10.0, step=0.1, value=get_or_set("gs_growth", float(house_inputs.get("up_rate", 3.0))), key="gs_growth")
+        with colg2:
+            gs_cash = st.number_input("Cash ", min_value=0, value=get_or_set("gs_cash", int(house_inputs.get("cash", 30000))), step=100, key="gs_cash")
+            gs_price = st.number_input("Target Purchase Price ", min_value=0, value=get_or_set("gs_price", int(house_inputs.get("price", 70000))), step=500, key="gs_price")
+            gs_rate = st.slider("Interest Rate (%)", min_value=2.0, max_value=8.0, step=0.1, value=get_or_set("gs_rate", float(house_inputs.get("loan_rate", 3.8))), key="gs_rate")
+            gs_year = st.slider("Loan Term (Y)", min_value=10, max_value=40, value=get_or_set("gs_year", int(house_inputs.get("loan_year", 30))), key="gs_year")
+
+        # 주거비는 대출 상환으로 대체하므로 지출에서 제외
+        household = Household(
+            income=income_monthly,
+            gross_income=graph.get("income").sum(axis=0),
+            expense=expense_monthly - budget["housing"],
+        )
+        max_dsr = gs_max_dsr / 100 if gs_use_dsr else None
+        with spans.span("compute:goal_seek"):
+            best_price = max_house_price(household, gs_cash, gs_rate, gs_year, gs_min_balance, max_dsr)
+            need_cash = min_cash(household, gs_price, gs_rate, gs_year, gs_min_balance, max_dsr)
+            last_year = latest_purchase_year(household, gs_price, gs_cash, gs_rate, gs_year, gs_growth, gs_min_balance, max_dsr)
+        colr1, colr2, colr3 = st.columns(3)
+        colr1.metric("Max House Price", "—" if best_price is None else f"{best_price:,.0f}")
+        colr2.metric("Min Cash for Target", "—" if need_cash is None else f"{need_cash:,.0f}")
+        colr3.metric("Latest Purchase Year", "—" if last_year is None else f"{all_years[0] + last_year}")
+        st.caption("※ Purchase at start of simulation for price/cash; housing expense on Page 3 is replaced by the loan repayment.")
+
+    # ---- 몬테카를로 시나리오 ----
+    st.markdown("---")
+    st.markdown("#### 🎲 Monte Carlo Scenario (Wage / Inflation / House Price)")
+    if st.checkbox("Run Monte Carlo", key="mc_enabled"):
+        colm1, colm2 = st.columns(2)
+        with colm1:
+            mc_paths = st.select_slider("Paths", options=[1000, 5000, 10000, 50000, 100000], value=get_or_set("mc_paths", 10000), key="mc_paths")
+            wage_sigma = st.slider("Wage Growth Volatility (%p)", min_value=0.0, max_value=5.0, step=0.1, value=get_or_set("mc_wage_sigma", 1.5), key="mc_wage_sigma")
+            cpi_sigma = st.slider("Inflation Volatility (%p)", min_value=0.0, max_value=5.0, step=0.1, value=get_or_set("mc_cpi_sigma", 1.0), key="mc_cpi_sigma")
+            house_mu = st.slider("House Price Mean Growth (%)", min_value=-5.0, max_value=10.0, step=0.1, value=get_or_set("mc_house_mu", 2.0), key="mc_house_mu")
+            house_sigma = st.slider("House Price Volatility (%p)", min_value=0.0, max_value=20.0, step=0.5, value=get_or_set("mc_house_sigma", 6.0), key="mc_house_sigma")
+        with colm2:
+            rho_wc = st.slider("Corr. Wage-Inflation", min_value=-0.9, max_value=0.9, step=0.1, value=get_or_set("mc_rho_wc", 0.5), key="mc_rho_wc")
+            rho_wh = st.slider("Corr. Wage-House", min_value=-0.9, max_value=0.9, step=0.1, value=get_or_set("mc_rho_wh", 0.3), key="mc_rho_wh")
+            rho_ch = st.slider("Corr. Inflation-House", min_value=-0.9, max_value=0.9, step=0.1, value=get_or_set("mc_rho_ch", 0.4), key="mc_rho_ch")
+            mc_seed = st.number_input("Seed", min_value=0, value=get_or_set("mc_seed", 0), step=1, key="mc_seed")
+            mc_parallel = st.checkbox("Use all CPU cores", value=get_or_set("mc_parallel", False), key="mc_parallel")
+
+        loan = graph.get("loan")
+        house_inputs = graph.input("loan_inputs")
+        n_years = tl.n_years
+        housing_yearly = tl.yearly(budget["housing"])
+        expense_yearly = tl.yearly(expense_monthly)
+        # 대출 상환액은 명목 고정, 나머지 지출은 물가 연동
+        nominal_yearly = np.zeros(n_years) if loan is None else housing_yearly
+        loan_balance = np.zeros(n_years)
+        if loan is not None:
+            year_end = loan.balance[11::12][:n_years]
+            loan_balance[:len(year_end)] = year_end
+        mc_inputs = ProjectionInputs(
+            income_yearly=tl.yearly(graph.get("leave")),
+            raise_rates=np.asarray(graph.input("income_inputs")["rates"]),
+            indexed_expense=expense_yearly - nominal_yearly,
+            nominal_expense=nominal_yearly,
+            inflation=graph.input("inflation"),
+            house_price=house_inputs["price"] if house_inputs is not None else 0.0,
+            loan_balance=loan_balance,
+        )
+        model = MarketModel(
+            wage_sigma=wage_sigma, cpi_sigma=cpi_sigma, house_mu=house_mu, house_sigma=house_sigma,
+            corr=((1.0, rho_wc, rho_wh), (rho_wc, 1.0, rho_ch), (rho_wh, rho_ch, 1.0)),
+        )
+        try:
+            with spans.span("compute:monte_carlo"):
+                mc_cash, mc_assets = monte_carlo_stage(mc_inputs, model, mc_paths, seed=int(mc_seed), parallel=mc_parallel)
+        except ValueError as e:
+            st.error(f"❗️{e}")
+            st.stop()
+
+        x = tl.years
+        for title, bands, color in [
+            ("Cumulative Net Cash Flow (Percentiles)", fan(mc_cash), "#7030A0"),
+            ("Net Assets incl. House Equity (Percentiles)", fan(mc_assets), "#2E75B6"),
+        ]:
+            chart(fan_chart, figsize=(10, 4), x=x, bands=bands, color=color, xlabel="Y", title=title)
+        st.caption(f"※ {mc_paths:,} paths, P(cumulative cash < 0 at end) = {(mc_cash[:, -1] < 0).mean()*100:.1f}%")
+
+# ---- 다섯번째 페이지 ----
+elif page == "시나리오 비교":
+    st.title("⚖️ Scenario Comparison")
+    # 0 = 현재 세션 (저장하지 않은 입력), 그 외는 저장된 시나리오 id
+    labels = {sid: name for sid, name, _ in scenario_store().list(limit=500)}
+    if graph.ready("cashflow"):
+        labels = {0: "Current (unsaved)", **labels}
+    if not labels:
+        st.info("Save scenarios from the sidebar (💾 Scenarios) to compare them here.")
+        st.stop()
+    fit_state("cmp_pick", list(labels))
+    picked = st.multiselect("Scenarios to compare", list(labels), default=list(labels)[:2],
+                            format_func=labels.get, key="cmp_pick")
+    if not picked:
+        st.stop()
+    stored = scenario_store().load_inputs([sid for sid in picked if sid])
+    inputs_list = [graph.snapshot()[0] if sid == 0 else stored[sid][1] for sid in picked]
+    names = [labels[sid] for sid in picked]
+    with spans.span("compute:compare"):
+        cmp = compare_scenarios(inputs_list)
+    year_x = cmp.years
+
+    for title, values in [
+        ("Cumulative Net Cash Flow", cmp.cumulative),
+        ("Net Worth (Cash + Accounts + House - Loan Left)", cmp.net_assets),
+    ]:
+        masked = np.where(cmp.valid, values, np.nan)
+        chart(
+            line_chart, figsize=(10, 4), x=year_x, marker=None, zero_line=True,
+            series=[(name, row, None) for name, row in zip(names, masked)],
+            xlabel="Y", ylabel=title, title=title,
+        )
+
+    st.markdown("#### 📊 Per-Year Deltas vs Baseline")
+    colcmp1, colcmp2 = st.columns(2)
+    with colcmp1:
+        fit_state("cmp_base", picked)
+        base_sid = st.selectbox("Baseline", picked, format_func=labels.get, key="cmp_base")
+    with colcmp2:
+        metric = st.selectbox("Metric", ["Net (Savable)", "Cumulative", "Net Assets"], key="cmp_metric")
+    values = {"Net (Savable)": cmp.net, "Cumulative": cmp.cumulative, "Net Assets": cmp.net_assets}[metric]
+    diff = np.where(cmp.valid & cmp.valid[picked.index(base_sid)], deltas(values, picked.index(base_sid)), np.nan)
+    with spans.span("dataframe"):
+        delta_df = pd.DataFrame({"Y": year_x, **{name: row for name, row in zip(names, diff)}})
+    table(delta_df, {name: "{:+,.0f}" for name in names})
+
+spans.end()
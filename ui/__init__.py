@@ -0,0 +1 @@
+"""Streamlit 페이지용 화면 구성 도우미 (차트 렌더링 등)"""
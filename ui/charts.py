@@ -0,0 +1,123 @@
+# 차트 렌더링: pyplot 전역 상태 없이 Figure를 직접 만들어 PNG/SVG 바이트로 변환하고 캐시
+from io import BytesIO
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from engine.cache import LRUCache, fingerprint
+
+
+class ChartCache(LRUCache):
+    """총 바이트 수로 제한하는 렌더링 결과 캐시 (세션 스레드끼리 공유, LRUCache의 잠금 사용)"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, maxsize=256):
+        super().__init__(maxsize)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= len(self._data[key])
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self.nbytes += len(value)
+            while self._data and (self.nbytes > self.max_bytes or len(self._data) > self.maxsize):
+                _, old = self._data.popitem(last=False)
+                self.nbytes -= len(old)
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self.nbytes = 0
+
+
+_cache = ChartCache()
+
+
+def render(draw, figsize=(8, 5), fmt="png", dpi=100, **data):
+    """draw(ax, **data)로 그린 차트의 이미지 바이트. 같은 그리기 함수·데이터·옵션이면 캐시에서 반환"""
+    key = fingerprint(draw.__module__, draw.__qualname__, figsize, fmt, dpi, data)
+    image = _cache.get(key)
+    if image is None:
+        # pyplot에 등록되지 않는 Figure라 참조가 끝나면 바로 정리됨
+        fig = Figure(figsize=figsize)
+        draw(fig.subplots(), **data)
+        buf = BytesIO()
+        fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches="tight")
+        fig.clear()
+        image = buf.getvalue()
+        if fmt == "svg":
+            image = image.decode("utf-8")
+        _cache.put(key, image)
+    return image
+
+
+def _finish(ax, xlabel, ylabel, title, legend=True):
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    if legend and ax.get_legend_handles_labels()[0]:
+        ax.legend()
+
+
+def _sparse_labels(labels, step):
+    return [lab if i % step == 0 else "" for i, lab in enumerate(labels)]
+
+
+def stacked_bars(ax, x_labels, series, totals=None, xlabel="", ylabel="", title=""):
+    """누적 막대. series는 (이름, 값, 색) 목록, totals가 있으면 막대 위에 합계 표시"""
+    x = np.arange(len(x_labels))
+    bottom = np.zeros(len(x_labels))
+    for label, values, color in series:
+        ax.bar(x, values, bottom=bottom, label=label, color=color)
+        bottom = bottom + np.asarray(values)
+    if totals is not None:
+        for i, total in enumerate(totals):
+            ax.text(i, total + 2, f"{int(total):,} ", ha='center', va='bottom', fontsize=6, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(x_labels)
+    _finish(ax, xlabel, ylabel, title)
+
+
+def grouped_bars(ax, x_labels, series, xlabel="", ylabel="", title="", label_step=1, fontsize=10, width=0.25):
+    """묶음 막대. series는 (이름, 값, 색) 목록"""
+    x = np.arange(len(x_labels))
+    for offset, (label, values, color) in enumerate(series):
+        ax.bar(x + offset * width, values, width, label=label, color=color)
+    ax.set_xticks(x + width)
+    ax.set_xticklabels(_sparse_labels(x_labels, label_step), rotation=45, fontsize=fontsize)
+    _finish(ax, xlabel, ylabel, title)
+
+
+def line_chart(ax, x, series, xlabel="", ylabel="", title="", marker='o', zero_line=False, x_labels=None,
+               label_step=1):
+    """선 그래프. series는 (이름, 값, 색) 목록 (색이 None이면 기본 색)"""
+    for label, values, color in series:
+        ax.plot(x, values, marker=marker, label=label, color=color)
+    if zero_line:
+        ax.axhline(0, color="gray", linestyle="--", linewidth=1)
+    if x_labels is not None:
+        ax.set_xticks(x)
+        ax.set_xticklabels(_sparse_labels(x_labels, label_step), rotation=45, fontsize=8)
+    _finish(ax, xlabel, ylabel, title)
+
+
+def fan_chart(ax, x, bands, color, xlabel="", ylabel="", title=""):
+    """백분위 팬 차트. bands는 (P5, P25, P50, P75, P95) 순서의 배열"""
+    ax.fill_between(x, bands[0], bands[4], color=color, alpha=0.15, label="P5~P95")
+    ax.fill_between(x, bands[1], bands[3], color=color, alpha=0.35, label="P25~P75")
+    ax.plot(x, bands[2], color=color, label="Median")
+    ax.axhline(0, color="gray", linestyle="--", linewidth=1)
+    _finish(ax, xlabel, ylabel, title)
+
+
+def heatmap(ax, z, x_values, y_values, xlabel="", ylabel="", title="", levels=8, label_fmt="{:,.0f}"):
+    """2차원 격자 히트맵 + 등고선. z는 (y × x) 배열"""
+    extent = (x_values[0], x_values[-1], y_values[0], y_values[-1])
+    im = ax.imshow(z, origin="lower", aspect="auto", extent=extent, cmap="viridis")
+    ax.figure.colorbar(im, ax=ax)
+    if len(x_values) > 1 and len(y_values) > 1:
+        cs = ax.contour(x_values, y_values, z, levels=levels, colors="white", linewidths=0.8)
+        ax.clabel(cs, fontsize=7, fmt=lambda v: label_fmt.format(v))
+    _finish(ax, xlabel, ylabel, title, legend=False)
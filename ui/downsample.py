@@ -0,0 +1,49 @@
+# 표시용 다운샘플링: 점 수가 예산을 넘는 시계열만 모양(봉우리·골짜기)을 유지하며 줄인다
+import numpy as np
+
+
+def minmax_indices(series, n_buckets):
+    """시계열 여러 개(같은 길이)를 n_buckets 구간으로 나눠 구간마다 각 시계열의 최소·최대 위치를 모은
+    인덱스 (정렬, 중복 제거, 양 끝점 포함). 묶음 막대처럼 여러 시계열이 같은 x를 써야 할 때 사용"""
+    ys = np.atleast_2d(np.asarray(series, dtype=float))
+    n = ys.shape[1]
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    width = -(-n // n_buckets)
+    n_buckets = -(-n // width)
+    padded = np.full((ys.shape[0], n_buckets * width), np.nan)
+    padded[:, :n] = ys
+    blocks = padded.reshape(ys.shape[0], n_buckets, width)
+    offset = np.arange(n_buckets)[None, :] * width
+    picks = np.concatenate([
+        (np.nanargmin(blocks, axis=2) + offset).ravel(),
+        (np.nanargmax(blocks, axis=2) + offset).ravel(),
+        [0, n - 1],
+    ])
+    return np.unique(picks)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: 선 그래프 모양을 가장 잘 유지하는 n_out개 점의 인덱스"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # 첫 점과 마지막 점 사이를 n_out - 2개 구간으로
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picks = np.empty(n_out, dtype=int)
+    picks[0], picks[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        # 직전 선택점 a, 후보, 다음 구간 평균점이 만드는 삼각형 넓이(의 2배)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        picks[i + 1] = a
+    return picks